@@ -4,11 +4,17 @@
 # Note: DynamoDB batch write is limited to 25 items.
 #
 import argparse
-import json
 import random
+import sys
+
+try:
+    import orjson
+except ImportError:  # fall back to the (slower) standard library encoder
+    orjson = None
+    import json
 
 from faker import Faker
-from faker.providers import profile, bank, color
+from faker.providers import bank, color
 
 parser = argparse.ArgumentParser(description='Generate randomized test data \
                                             for the bond table in dynamodb')
@@ -25,55 +31,80 @@ num_records = args.Records
 
 # fake data generator setup
 fake = Faker()
-fake.add_provider(profile)
 fake.add_provider(bank)
 fake.add_provider(color)
 
+# bind the generator methods once so that each call skips the Faker proxy
+# lookup. Only the name, email and username were ever used from profile(),
+# which also builds a batch of fields we discard, so call those directly.
+_name = fake.name
+_email = fake.email
+_user_name = fake.user_name
+_md5 = fake.md5
+_bban = fake.bban
+_color = fake.safe_color_name
+_randint = random.Random().randint
+
+
+def dumps(obj, pretty: bool = False) -> bytes:
+    """Serialize obj to JSON bytes, using orjson if it is available."""
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS if pretty else 0
+        return orjson.dumps(obj, option=option)
+    if pretty:
+        return json.dumps(obj, sort_keys=True, indent=4).encode()
+    return json.dumps(obj).encode()
 
-def gen_item(faker: Faker):
+
+def gen_item():
     def gen_random_subs():
         """
         Generate a random number of subscribers (0 to 7) and
-        return as a map.
+        return as a map keyed on subscriber id.
         """
-        def gen_sub() -> dict:
-            p = faker.profile()
-            return {
+        subscribers = {}
+        for _ in range(_randint(0, 7)):
+            sid = _user_name()
+            subscribers[sid] = {
                 "M": {
-                    "name": {"S": p['name']},
-                    "email": {"S": p['mail']},
-                    "sid": {"S": p['username']}
+                    "name": {"S": _name()},
+                    "email": {"S": _email()},
+                    "sid": {"S": sid}
                 }
             }
-
-        subscribers = {'M': {}}
-        for i in range(0, random.randint(0, 7)):
-            sub = gen_sub()
-            subscribers['M'][sub['M']['sid']['S']] = sub
-        return subscribers
+        return {"M": subscribers}
 
     return {
             "PutRequest": {
                 "Item": {
-                    "bond_id": {"S": fake.md5()},
-                    "host_account_id": {"S": fake.bban()},
-                    "sub_account_id": {"S": fake.bban()},
-                    "host_cost_center": {"S": fake.safe_color_name()},
-                    "sub_cost_center": {"S": fake.safe_color_name()},
+                    "bond_id": {"S": _md5()},
+                    "host_account_id": {"S": _bban()},
+                    "sub_account_id": {"S": _bban()},
+                    "host_cost_center": {"S": _color()},
+                    "sub_cost_center": {"S": _color()},
                     "subscribers": gen_random_subs()
                 }
             }
     }
 
 
-data = {"bond": []}
-for item in (gen_item(fake) for i in range(num_records)):
-    data['bond'].append(item)
+def write_items(out, count: int, pretty: bool = False) -> None:
+    """
+    Stream count generated items to the binary file object out as a
+    {"bond": [...]} document, one item at a time, so memory use stays flat
+    regardless of the number of records.
+    """
+    out.write(b'{"bond": [\n')
+    for i in range(count):
+        if i:
+            out.write(b',\n')
+        out.write(dumps(gen_item(), pretty=pretty))
+    out.write(b'\n]}\n')
 
 
 # pretty print to STDOUT if no output file was provided.
 if not args.o:
-    print(json.dumps(data, sort_keys=True, indent=4))
+    write_items(sys.stdout.buffer, num_records, pretty=True)
 else:
-    with open(args.o, "w") as write_file:
-        json.dump(data, write_file)
\ No newline at end of file
+    with open(args.o, "wb") as write_file:
+        write_items(write_file, num_records)
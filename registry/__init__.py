@@ -1,8 +1,13 @@
 import logging.config
 import yaml
 
+try:
+    from yaml import CSafeLoader as _Loader  # libyaml bindings, if built
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
 with open('logging_config.yaml', 'r') as f:
-    config = yaml.safe_load(f.read())
+    config = yaml.load(f, Loader=_Loader)
     logging.config.dictConfig(config)
 
 logger = logging.getLogger("bond.registry")
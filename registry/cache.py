@@ -0,0 +1,91 @@
+"""
+A small, thread-safe, in-process cache with a time-to-live and a bounded
+size (least recently used entries are evicted first).
+
+It is deliberately local to the process: each worker keeps its own cache,
+so entries should have a short time-to-live to bound how stale a read can
+be after another worker writes.
+
+Within a process, a value read from the backing store should be cached
+with put(key, value, generation), passing the generation() taken before the
+read. If an entry was invalidated (popped or cleared) while the read was in
+flight, the value may predate that write and is not cached.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """A bounded LRU cache whose entries expire after a time-to-live.
+
+    Public attributes:
+    - maxsize (int): The maximum number of entries held.
+    - ttl (float): The number of seconds an entry stays valid.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expiry time, value)
+        self._generation = 0  # bumped by every invalidation
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the value cached for key, or None if there is no live
+        entry for it.
+
+        Args:
+            key: The key to look up.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def generation(self) -> int:
+        """Return the current generation of the cache, to pass to put()
+        when caching a value read after this call."""
+        with self._lock:
+            return self._generation
+
+    def put(self, key, value, generation: int = None) -> None:
+        """Cache value under key, evicting the least recently used entry if
+        the cache is full.
+
+        Args:
+            key: The key to cache the value under.
+            value: The value to cache.
+            generation (int, Default=None): The generation() taken before
+                value was read. If any entry has been invalidated since,
+                value is not cached.
+        """
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, key) -> None:
+        """Remove the entry for key. Ignore if there is no such entry.
+
+        Args:
+            key: The key to remove.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+            self._generation += 1
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
@@ -20,9 +20,13 @@ to request services from the host account.
 
 Available functions:
 - create_bond: Insert a new bond into the database.
+- bulk_create_bonds: Insert (or overwrite) a batch of bonds in the database.
 - update_bond: Update bond values in the database.
 - delete_bond: Delete a bond from the database.
 - get_bond: Fetch a bond from the database based on the bond's unique id.
+- get_bond_raw: Fetch the stored item of a bond based on the bond's unique id.
+- query_bonds_raw: Fetch the stored items of all bonds matching an indexed
+  attribute.
 - get_bonds_by_host_cost_center: Fetch all bonds for a host cost center.
 - get_bonds_by_host_account_id: Fetch all bonds for a host account.
 - get_bonds_by_sub_cost_center: Fetch all bonds for a subscriber cost center.
@@ -32,21 +36,116 @@ Available functions:
 """
 from registry.models import Bond, Subscriber
 from registry import logger
-from registry.db import db_connector, ConditionalCheckError, \
-    RegistryClientError
-from typing import List
-from fastapi.encoders import jsonable_encoder
+from registry.cache import TTLCache
+from registry.db import db_client_connector, \
+    ConditionalCheckError, RegistryClientError, TABLE_NAME
+from typing import Dict, List
+from operator import itemgetter
+import random
+import time
 
-from boto3.dynamodb.conditions import Key
 from botocore.exceptions import ClientError
 
+# Fetches the bond header attributes from an item in a single call.
+_BOND_FIELDS = itemgetter('bond_id', 'host_account_id', 'sub_account_id',
+                          'host_cost_center', 'sub_cost_center')
+
+# Projects only the bond header attributes, i.e. everything but subscribers.
+_HEADER_PROJECTION = "bond_id, host_account_id, sub_account_id, " \
+                     "host_cost_center, sub_cost_center"
+
+# Recently fetched bond items, keyed on bond id. The cache is per process,
+# so the short time-to-live bounds how stale a read can be after a write
+# handled by another worker. Every write in this module invalidates the
+# bond it touches.
+bond_cache = TTLCache(maxsize=4096, ttl=5)
+
+# Update and condition expressions that never change between requests.
+_UPDATE_BOND_EXPR = "set host_account_id = :had, sub_account_id = :sad, " \
+                    "host_cost_center = :hcc, sub_cost_center = :scc, " \
+                    "subscribers = :sub"
+_ADD_SUB_EXPR = "set subscribers.#sid = :sub"
+_REMOVE_SUB_EXPR = "remove subscribers.#sid"
+_COND_EXISTS = 'attribute_exists(bond_id)'
+_COND_NOT_EXISTS = 'attribute_not_exists(bond_id)'
+
+# The most writes a single BatchWriteItem request may hold.
+_BATCH_SIZE = 25
+
+# How often a batch is sent before its unprocessed writes are given up on,
+# and the base and cap (in seconds) of the exponential backoff between
+# attempts. DynamoDB returns unprocessed writes when it is throttling.
+_BATCH_MAX_ATTEMPTS = 8
+_BATCH_BACKOFF_BASE = 0.05
+_BATCH_BACKOFF_CAP = 5.0
+
+# Maps each searchable attribute to its secondary index and key condition.
+# Only the :value placeholder varies between queries.
+_INDEX_MAP = {
+    'host_cost_center': ("bond-host_cost_center-index",
+                         "host_cost_center = :value"),
+    'host_account_id': ("bond-host_account_id-index",
+                        "host_account_id = :value"),
+    'sub_cost_center': ("bond-sub_cost_center-index",
+                        "sub_cost_center = :value"),
+    'sub_account_id': ("bond-sub_account_id-index",
+                       "sub_account_id = :value"),
+}
+
+
+def to_attribute(value) -> dict:
+    """A helper function to convert a value to a DynamoDB attribute value.
+    Bond attributes are all strings or (nested) maps of strings, so this
+    covers just those two types rather than the full boto3 serializer."""
+    if isinstance(value, dict):
+        return {'M': {k: to_attribute(v) for k, v in value.items()}}
+    return {'S': value}
+
+
+def from_attribute(attr: dict):
+    """A helper function to convert a DynamoDB attribute value (a string or
+    a map) back to a Python value."""
+    if 'S' in attr:
+        return attr['S']
+    return {k: from_attribute(v) for k, v in attr['M'].items()}
+
+
+def marshal_item(item: dict) -> dict:
+    """A helper function to convert an item to DynamoDB's typed format."""
+    return {k: to_attribute(v) for k, v in item.items()}
+
+
+def unmarshal_item(item: dict) -> dict:
+    """A helper function to convert an item from DynamoDB's typed format."""
+    return {k: from_attribute(v) for k, v in item.items()}
+
+
+def encode_subscribers(subscribers: Dict[str, Subscriber]) -> dict:
+    """A helper function to convert a bond's subscribers to a DynamoDB map.
+    Subscriber fields are all strings, so a plain dict() of each model is
+    enough; there is no need for the generic jsonable_encoder walk."""
+    return {sid: sub.dict() for sid, sub in subscribers.items()}
+
+
+def item_from_bond(bond: Bond) -> dict:
+    """A helper function to convert a Bond object to a DynamoDB item."""
+    return {
+        'bond_id': bond.bond_id,
+        'host_account_id': bond.host_account_id,
+        'sub_account_id': bond.sub_account_id,
+        'host_cost_center': bond.host_cost_center,
+        'sub_cost_center': bond.sub_cost_center,
+        'subscribers': encode_subscribers(bond.subscribers)
+    }
+
 
-@db_connector
+@db_client_connector
 def create_bond(conn, bond: Bond) -> Bond:
     """Insert a new bond.
 
     Args:
-        conn (func): A connection to the Dynamodb table (from db_connector).
+        conn (func): A client connection to Dynamodb (from
+            db_client_connector).
         bond (Bond): The bond object to insert.
 
     Raises:
@@ -58,14 +157,10 @@ def create_bond(conn, bond: Bond) -> Bond:
     logger.debug(f"crud: create bond: bond={bond}")
 
     try:
-        response = conn.put_item(Item={
-            'bond_id': bond.bond_id,
-            'host_account_id': bond.host_account_id,
-            'sub_account_id': bond.sub_account_id,
-            'host_cost_center': bond.host_cost_center,
-            'sub_cost_center': bond.sub_cost_center,
-            'subscribers': jsonable_encoder(bond.subscribers)
-        }, ConditionExpression='attribute_not_exists(bond_id)')
+        response = conn.put_item(
+            TableName=TABLE_NAME,
+            Item=marshal_item(item_from_bond(bond)),
+            ConditionExpression=_COND_NOT_EXISTS)
     except ClientError as e:
         if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
             logger.debug(f"crud: bond already exists: bond_id={bond.bond_id}")
@@ -76,15 +171,86 @@ def create_bond(conn, bond: Bond) -> Bond:
             raise RegistryClientError(f"Unexpected error querying the "
                                       f"registry: {str(e)}")
     logger.debug(f"Dynamodb response={response}")
+    bond_cache.pop(bond.bond_id)
     return bond
 
 
-@db_connector
+def _batch_write(conn, writes: List[dict]) -> None:
+    """A helper function to send one BatchWriteItem request, retrying any
+    unprocessed writes with exponential backoff (and full jitter).
+
+    Args:
+        conn (func): A client connection to Dynamodb.
+        writes (list): The write requests, at most _BATCH_SIZE of them.
+
+    Raises:
+        RegistryClientError if some writes are still unprocessed after
+            _BATCH_MAX_ATTEMPTS."""
+    pending = {TABLE_NAME: writes}
+    for attempt in range(_BATCH_MAX_ATTEMPTS):
+        if attempt:
+            time.sleep(random.uniform(0, min(
+                _BATCH_BACKOFF_CAP, _BATCH_BACKOFF_BASE * 2 ** attempt)))
+        response = conn.batch_write_item(RequestItems=pending)
+        pending = response.get('UnprocessedItems')
+        if not pending:
+            return
+    unwritten = len(pending[TABLE_NAME])
+    logger.error(f"crud: {unwritten} bonds unprocessed after "
+                 f"{_BATCH_MAX_ATTEMPTS} attempts")
+    raise RegistryClientError(f"Failed to write {unwritten} bonds: the "
+                              f"registry is throttling requests.")
+
+
+@db_client_connector
+def bulk_create_bonds(conn, bonds: List[Bond]) -> List[Bond]:
+    """Insert a batch of bonds. The writes are grouped into as few
+    BatchWriteItem requests as possible (25 items per request) and any
+    unprocessed items are retried.
+
+    Note that, unlike create_bond, a batch write cannot be conditional: a
+    bond that already exists is overwritten. If a bond id appears more than
+    once, the last bond with that id is written.
+
+    Args:
+        conn (func): A client connection to Dynamodb (from
+            db_client_connector).
+        bonds (list): The bond objects to insert.
+
+    Raises:
+        RegistryClientError if connecting to or querying the database fails,
+            or if some bonds are still unprocessed after _BATCH_MAX_ATTEMPTS.
+
+    Returns:
+        The list of bond objects inserted."""
+    logger.debug(f"crud: bulk create bonds: count={len(bonds)}")
+
+    # a batch may not write the same item twice, so keep the last bond only.
+    items = {bond.bond_id: item_from_bond(bond) for bond in bonds}
+    writes = [{'PutRequest': {'Item': marshal_item(item)}}
+              for item in items.values()]
+    try:
+        for i in range(0, len(writes), _BATCH_SIZE):
+            _batch_write(conn, writes[i:i + _BATCH_SIZE])
+    except ClientError as e:
+        logger.error("crud: Unexpected error: %s" % e)
+        raise RegistryClientError(f"Unexpected error querying the "
+                                  f"registry: {str(e)}")
+    finally:
+        # invalidate even if a batch failed, as earlier batches (and part
+        # of the failed one) may have been written.
+        for bond_id in items:
+            bond_cache.pop(bond_id)
+    return bonds
+
+
+@db_client_connector
 def update_bond(conn, bond: Bond) -> Bond:
     """Update a bond.
 
     Args:
-        conn (func): A connection to the Dynamodb table (from db_connector).
+        conn (func): A client connection to Dynamodb (from
+            db_client_connector).
         bond (Bond): The bond object to update.
 
     Raises:
@@ -97,22 +263,19 @@ def update_bond(conn, bond: Bond) -> Bond:
 
     try:
         response = conn.update_item(
+            TableName=TABLE_NAME,
             Key={
-                'bond_id': bond.bond_id
+                'bond_id': {'S': bond.bond_id}
             },
-            UpdateExpression="set host_account_id = :had, " +
-                             "sub_account_id = :sad, " +
-                             "host_cost_center = :hcc, " +
-                             "sub_cost_center = :scc, " +
-                             "subscribers = :sub",
+            UpdateExpression=_UPDATE_BOND_EXPR,
             ExpressionAttributeValues={
-                ':had': bond.host_account_id,
-                ':sad': bond.sub_account_id,
-                ':hcc': bond.host_cost_center,
-                ':scc': bond.sub_cost_center,
-                ':sub': jsonable_encoder(bond.subscribers)
+                ':had': {'S': bond.host_account_id},
+                ':sad': {'S': bond.sub_account_id},
+                ':hcc': {'S': bond.host_cost_center},
+                ':scc': {'S': bond.sub_cost_center},
+                ':sub': to_attribute(encode_subscribers(bond.subscribers))
             },
-            ConditionExpression='attribute_exists(bond_id)',
+            ConditionExpression=_COND_EXISTS,
             ReturnValues="UPDATED_NEW")
     except ClientError as e:
         if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
@@ -124,15 +287,17 @@ def update_bond(conn, bond: Bond) -> Bond:
             raise RegistryClientError(f"Unexpected error querying the "
                                       f"registry: {str(e)}")
     logger.debug(f"Dynamodb response={response}")
+    bond_cache.pop(bond.bond_id)
     return bond
 
 
-@db_connector
+@db_client_connector
 def delete_bond(conn, bond_id: str) -> None:
     """Delete a bond. Does nothing if the bond does not exist.
 
     Args:
-        conn (func): A connection to the Dynamodb table (from db_connector).
+        conn (func): A client connection to Dynamodb (from
+            db_client_connector).
         bond_id (str): The bond id of the bond to delete.
 
     Raises:
@@ -141,66 +306,135 @@ def delete_bond(conn, bond_id: str) -> None:
 
     try:
         response = conn.delete_item(
+            TableName=TABLE_NAME,
             Key={
-                'bond_id': bond_id
+                'bond_id': {'S': bond_id}
             })
     except ClientError as e:
         logger.error("crud: Unexpected error: %s" % e)
         raise RegistryClientError(f"Unexpected error querying the "
                                   f"registry: {str(e)}")
     logger.debug(f"Dynamodb response={response}")
+    bond_cache.pop(bond_id)
 
 
 def bond_from_item(item) -> Bond:
-    """A helper function to convert a DynamoDB item to a Bond object."""
-    bond = Bond(
-        bond_id=item["bond_id"],
-        host_account_id=item["host_account_id"],
-        sub_account_id=item["sub_account_id"],
-        host_cost_center=item["host_cost_center"],
-        sub_cost_center=item["sub_cost_center"],
-        subscribers=item["subscribers"]
-    )
+    """A helper function to convert a DynamoDB item to a Bond object. The
+    subscribers default to empty if they were not projected. Items were
+    validated on the way in, so they are not validated again here."""
+    bond_id, host_account_id, sub_account_id, host_cost_center, \
+        sub_cost_center = _BOND_FIELDS(item)
+    bond = Bond.from_trusted(dict(
+        bond_id=bond_id,
+        host_account_id=host_account_id,
+        sub_account_id=sub_account_id,
+        host_cost_center=host_cost_center,
+        sub_cost_center=sub_cost_center,
+        subscribers=item.get("subscribers", {})
+    ))
     return bond
 
 
-@db_connector
-def execute_query(conn, query_expr: dict) -> str:
+@db_client_connector
+def execute_query(conn, query_expr: dict) -> dict:
     """A helper function to execute a query against Dynamo db.
 
     Args:
-        conn (func): A connection to the Dynamodb table (from db_connector).
+        conn (func): A client connection to Dynamodb (from
+            db_client_connector).
         query_expr (dict): A dictionary containing Dynamodb-specific query
-            attributes: KeyConditionExpression and IndexName (if applicable).
+            attributes: KeyConditionExpression and ExpressionAttributeValues
+            (in DynamoDB's typed format), and IndexName, ProjectionExpression
+            and ExpressionAttributeNames (if applicable).
 
     Raises:
         RegistryClientError if connecting to or querying the database fails.
 
     Returns:
-        The Dynamodb query API results as JSON."""
+        The Dynamodb query API results, with the Items unmarshalled."""
     try:
-        if 'IndexName' not in query_expr.keys():
-            response = conn.query(
-                KeyConditionExpression=query_expr['KeyConditionExpression']
-            )
-        else:
-            response = conn.query(
-                IndexName=query_expr['IndexName'],
-                KeyConditionExpression=query_expr['KeyConditionExpression']
-            )
+        response = conn.query(TableName=TABLE_NAME, **query_expr)
     except ClientError as e:
         logger.error("crud: Unexpected error: %s" % e)
         raise RegistryClientError(f"Unexpected error querying the "
                                   f"registry: {str(e)}")
     logger.debug(f"Dynamodb response={response}")
+    response['Items'] = [unmarshal_item(item) for item in response['Items']]
     return response
 
 
-def get_bond(bond_id: str) -> Bond:
-    """Get a bond with the given id.
+@db_client_connector
+def get_item(conn, key: dict) -> dict:
+    """A helper function to fetch a single item from Dynamo db by its
+    primary key.
+
+    Args:
+        conn (func): A client connection to Dynamodb (from
+            db_client_connector).
+        key (dict): The primary key of the item to fetch.
+
+    Raises:
+        RegistryClientError if connecting to or querying the database fails.
+
+    Returns:
+        The item or None if not found."""
+    try:
+        response = conn.get_item(TableName=TABLE_NAME,
+                                 Key=marshal_item(key))
+    except ClientError as e:
+        logger.error("crud: Unexpected error: %s" % e)
+        raise RegistryClientError(f"Unexpected error querying the "
+                                  f"registry: {str(e)}")
+    logger.debug(f"Dynamodb response={response}")
+    item = response.get('Item')
+    return None if item is None else unmarshal_item(item)
+
+
+def get_bond_raw(bond_id: str, use_cache: bool = True) -> dict:
+    """Get the item of the bond with the given id as stored, i.e. without
+    building it into a Bond object. Items found are cached for a few
+    seconds (see bond_cache), so repeated reads skip the database.
+
+    Args:
+        bond_id (str): The bond id of the bond to fetch.
+        use_cache (bool, Default=True): If false, always read the bond from
+            the database. Use this when the bond is read to be written back,
+            as the cache may miss writes made by other workers.
+
+    Raises:
+        RegistryClientError if connecting to or querying the database fails.
+
+    Returns:
+        The requested bond item (dict) or None if not found. The item may be
+        the one held in the cache, so callers must not mutate it (or its
+        subscribers)."""
+    logger.debug(f"crud: get bond raw: bond_id={bond_id}")
+
+    item = bond_cache.get(bond_id) if use_cache else None
+    if item is None:
+        # taken before the read, so an item read before a write made by this
+        # process completes is not cached (see TTLCache.put).
+        generation = bond_cache.generation()
+        item = get_item({'bond_id': bond_id})
+
+        if item is None:
+            logger.debug(f"crud: bond not found: bond_id={bond_id}")
+            return None
+
+        bond_cache.put(bond_id, item, generation)
+
+    return item
+
+
+def get_bond(bond_id: str, use_cache: bool = True) -> Bond:
+    """Get a bond with the given id. Bonds found are cached for a few
+    seconds (see bond_cache), so repeated reads skip the database.
 
     Args:
         bond_id (str): The bond id of the bond to fetch.
+        use_cache (bool, Default=True): If false, always read the bond from
+            the database. Use this when the bond is read to be written back,
+            as the cache may miss writes made by other workers.
 
     Raises:
         RegistryClientError if connecting to or querying the database fails.
@@ -209,21 +443,70 @@ def get_bond(bond_id: str) -> Bond:
         The requested bond object or None if not found."""
     logger.debug(f"crud: get bond: bond_id={bond_id}")
 
-    query_expr = {'KeyConditionExpression': Key('bond_id').eq(bond_id)}
-    response = execute_query(query_expr)
+    item = get_bond_raw(bond_id, use_cache)
+    return None if item is None else bond_from_item(item)
+
+
+def query_bonds_raw(attribute: str, value: str,
+                    with_subscribers: bool = True) -> List[dict]:
+    """Get the items of all bonds whose attribute matches value, using the
+    secondary index on that attribute. The items are returned as stored,
+    i.e. without being built into (and validated as) Bond objects, for
+    callers that only pass them through.
+
+    Args:
+        attribute (str): The name of the indexed attribute to search on
+            (one of the keys of _INDEX_MAP).
+        value (str): The value to search for.
+        with_subscribers (bool, Default=True): If false, do not fetch the
+            subscribers; the items are returned without them.
+
+    Raises:
+        RegistryClientError if connecting to or querying the database fails.
+
+    Returns:
+        A list of bond items (dicts) or an empty list if none are found."""
+    logger.debug(f"crud: query bonds raw: {attribute}={value}")
+    index_name, key_condition = _INDEX_MAP[attribute]
+    query_expr = {
+        'IndexName': index_name,
+        'KeyConditionExpression': key_condition,
+        'ExpressionAttributeValues': {':value': {'S': value}}
+    }
+    if not with_subscribers:
+        query_expr['ProjectionExpression'] = _HEADER_PROJECTION
+    return execute_query(query_expr)['Items']
 
-    if len(response["Items"]) == 0:
-        logger.debug(f"crud: bond not found: bond_id={bond_id}")
-        return None
 
-    return bond_from_item(response["Items"][0])
+def get_bonds_by_index(attribute: str, value: str,
+                       with_subscribers: bool = True) -> List[Bond]:
+    """A helper function to get all bonds whose attribute matches value,
+    using the secondary index on that attribute.
 
+    Args:
+        attribute (str): The name of the indexed attribute to search on
+            (one of the keys of _INDEX_MAP).
+        value (str): The value to search for.
+        with_subscribers (bool, Default=True): If false, do not fetch the
+            subscribers; the bonds are returned with no subscribers.
 
-def get_bonds_by_host_cost_center(host_cost_center: str) -> List[Bond]:
+    Raises:
+        RegistryClientError if connecting to or querying the database fails.
+
+    Returns:
+        A list of bond objects or an empty list if none are found."""
+    items = query_bonds_raw(attribute, value, with_subscribers)
+    return [bond_from_item(item) for item in items]
+
+
+def get_bonds_by_host_cost_center(host_cost_center: str,
+                                  with_subscribers: bool = True) -> List[Bond]:
     """Get all bonds for the given *host* cost center.
 
     Args:
         host_cost_center (str): The host cost center identifier to search on.
+        with_subscribers (bool, Default=True): If false, do not fetch the
+            subscribers; the bonds are returned with no subscribers.
 
     Raises:
         RegistryClientError if connecting to or querying the database fails.
@@ -232,24 +515,18 @@ def get_bonds_by_host_cost_center(host_cost_center: str) -> List[Bond]:
         A list of bond objects or an empty list if none are found."""
     logger.debug(f"crud: get bonds by host cost center: "
                  f"host_cost_center={host_cost_center}")
-    bonds = []
+    return get_bonds_by_index('host_cost_center', host_cost_center,
+                              with_subscribers)
 
-    query_expr = {
-        'IndexName': "bond-host_cost_center-index",
-        'KeyConditionExpression': Key('host_cost_center').eq(host_cost_center)
-    }
-    response = execute_query(query_expr)
 
-    for item in response['Items']:
-        bonds.append(bond_from_item(item))
-    return bonds
-
-
-def get_bonds_by_host_account_id(host_account_id: str) -> List[Bond]:
+def get_bonds_by_host_account_id(host_account_id: str,
+                                 with_subscribers: bool = True) -> List[Bond]:
     """Get all bonds for the given *host* account.
 
     Args:
         host_account_id (str): The host account identifier to search on.
+        with_subscribers (bool, Default=True): If false, do not fetch the
+            subscribers; the bonds are returned with no subscribers.
 
     Raises:
         RegistryClientError if connecting to or querying the database fails.
@@ -258,24 +535,18 @@ def get_bonds_by_host_account_id(host_account_id: str) -> List[Bond]:
         A list of bond objects or an empty list if none are found."""
     logger.debug(f"crud: get bonds by host account id: "
                  f"host_account_id={host_account_id}")
-    bonds = []
-
-    query_expr = {
-        'IndexName': "bond-host_account_id-index",
-        'KeyConditionExpression': Key('host_account_id').eq(host_account_id)
-    }
-    response = execute_query(query_expr)
-
-    for item in response['Items']:
-        bonds.append(bond_from_item(item))
-    return bonds
+    return get_bonds_by_index('host_account_id', host_account_id,
+                              with_subscribers)
 
 
-def get_bonds_by_sub_cost_center(sub_cost_center: str) -> List[Bond]:
+def get_bonds_by_sub_cost_center(sub_cost_center: str,
+                                 with_subscribers: bool = True) -> List[Bond]:
     """Get all bonds for the given *subscriber* cost center.
 
     Args:
         sub_cost_center (str): The subscriber cost center id to search on.
+        with_subscribers (bool, Default=True): If false, do not fetch the
+            subscribers; the bonds are returned with no subscribers.
 
     Raises:
         RegistryClientError if connecting to or querying the database fails.
@@ -284,24 +555,18 @@ def get_bonds_by_sub_cost_center(sub_cost_center: str) -> List[Bond]:
         A list of bond objects or an empty list if none are found."""
     logger.debug(f"crud: get bonds by sub cost center: "
                  f"sub_cost_center={sub_cost_center}")
-    bonds = []
+    return get_bonds_by_index('sub_cost_center', sub_cost_center,
+                              with_subscribers)
 
-    query_expr = {
-        'IndexName': "bond-sub_cost_center-index",
-        'KeyConditionExpression': Key('sub_cost_center').eq(sub_cost_center)
-    }
-    response = execute_query(query_expr)
 
-    for item in response['Items']:
-        bonds.append(bond_from_item(item))
-    return bonds
-
-
-def get_bonds_by_sub_account_id(sub_account_id: str) -> List[Bond]:
+def get_bonds_by_sub_account_id(sub_account_id: str,
+                                with_subscribers: bool = True) -> List[Bond]:
     """Get all bonds for the given *subscriber* account.
 
     Args:
         sub_account_id (str): The subscriber account identifier to search on.
+        with_subscribers (bool, Default=True): If false, do not fetch the
+            subscribers; the bonds are returned with no subscribers.
 
     Raises:
         RegistryClientError if connecting to or querying the database fails.
@@ -310,24 +575,19 @@ def get_bonds_by_sub_account_id(sub_account_id: str) -> List[Bond]:
         A list of bond objects or an empty list if none are found."""
     logger.debug(f"crud: get bonds by sub account id: "
                  f"sub_account_id={sub_account_id}")
-    bonds = []
-
-    query_expr = {
-        'IndexName': "bond-sub_account_id-index",
-        'KeyConditionExpression': Key('sub_account_id').eq(sub_account_id)
-    }
-    response = execute_query(query_expr)
-
-    for item in response['Items']:
-        bonds.append(bond_from_item(item))
-    return bonds
+    return get_bonds_by_index('sub_account_id', sub_account_id,
+                              with_subscribers)
 
 
-def add_subscriber(bond_id: str, sub: Subscriber) -> Bond:
+@db_client_connector
+def add_subscriber(conn, bond_id: str, sub: Subscriber) -> Bond:
     """Add a subscriber to a bond. Overwrite if the subscriber is already
-    present.
+    present. Only the subscriber's entry in the subscribers map is written,
+    in a single conditional update.
 
     Args:
+        conn (func): A client connection to Dynamodb (from
+            db_client_connector).
         bond_id (str): The bond id of the bond to add the subscriber to.
         sub (Subscriber): The subscriber object to add to the bond.
 
@@ -338,19 +598,41 @@ def add_subscriber(bond_id: str, sub: Subscriber) -> Bond:
     Returns:
         The updated bond object."""
     logger.debug(f"crud: add subscriber: bond_id={bond_id}, sub={sub}")
-    bond = get_bond(bond_id)
-    if bond is None:
-        raise ConditionalCheckError(f'Bond {bond_id} not found. '
-                                    f'Cannot add subscriber {sub.sid}.')
-    bond.add_subscriber(sub)
-    return update_bond(bond)
+
+    try:
+        response = conn.update_item(
+            TableName=TABLE_NAME,
+            Key={
+                'bond_id': {'S': bond_id}
+            },
+            UpdateExpression=_ADD_SUB_EXPR,
+            ExpressionAttributeNames={'#sid': sub.sid},
+            ExpressionAttributeValues={':sub': to_attribute(sub.dict())},
+            ConditionExpression=_COND_EXISTS,
+            ReturnValues="ALL_NEW")
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            logger.debug(f"crud: bond not found: bond_id={bond_id}")
+            raise ConditionalCheckError(f'Bond {bond_id} not found. '
+                                        f'Cannot add subscriber {sub.sid}.')
+        else:
+            logger.error("crud: Unexpected error: %s" % e)
+            raise RegistryClientError(f"Unexpected error querying the "
+                                      f"registry: {str(e)}")
+    logger.debug(f"Dynamodb response={response}")
+    bond_cache.pop(bond_id)
+    return bond_from_item(unmarshal_item(response['Attributes']))
 
 
-def remove_subscriber(bond_id: str, sid: str) -> Bond:
+@db_client_connector
+def remove_subscriber(conn, bond_id: str, sid: str) -> Bond:
     """Remove a subscriber from a bond. Ignore if the subscriber is not
-    a current subscriber attached to the bond.
+    a current subscriber attached to the bond. Only the subscriber's entry
+    in the subscribers map is removed, in a single conditional update.
 
     Args:
+        conn (func): A client connection to Dynamodb (from
+            db_client_connector).
         bond_id (str): The bond id of the bond to remove the subscriber from.
         sid (str): The subscriber identifier of the subscriber to be removed.
 
@@ -361,9 +643,26 @@ def remove_subscriber(bond_id: str, sid: str) -> Bond:
     Returns:
         The updated bond object."""
     logger.debug(f"crud: remove subscriber: bond_id={bond_id}, sid={sid}")
-    bond = get_bond(bond_id)
-    if bond is None:
-        raise ConditionalCheckError(f'Bond {bond_id} not found. '
-                                    f'Cannot remove subscriber {sid}.')
-    bond.remove_subscriber(sid)
-    return update_bond(bond)
+
+    try:
+        response = conn.update_item(
+            TableName=TABLE_NAME,
+            Key={
+                'bond_id': {'S': bond_id}
+            },
+            UpdateExpression=_REMOVE_SUB_EXPR,
+            ExpressionAttributeNames={'#sid': sid},
+            ConditionExpression=_COND_EXISTS,
+            ReturnValues="ALL_NEW")
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            logger.debug(f"crud: bond not found: bond_id={bond_id}")
+            raise ConditionalCheckError(f'Bond {bond_id} not found. '
+                                        f'Cannot remove subscriber {sid}.')
+        else:
+            logger.error("crud: Unexpected error: %s" % e)
+            raise RegistryClientError(f"Unexpected error querying the "
+                                      f"registry: {str(e)}")
+    logger.debug(f"Dynamodb response={response}")
+    bond_cache.pop(bond_id)
+    return bond_from_item(unmarshal_item(response['Attributes']))
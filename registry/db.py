@@ -1,10 +1,15 @@
 """
-A decorator function to manage connectivity to the bond table in Dynamodb.
+Decorator functions to manage connectivity to the bond table in Dynamodb.
 """
 from registry import logger
 import os
+import threading
 import boto3
-from botocore.exceptions import ClientError
+from botocore.exceptions import ClientError, ParamValidationError
+
+# The name of the bond table. Overridden in tests, where each test worker
+# uses a table of its own.
+TABLE_NAME = os.environ.get("TABLE_NAME", "bond")
 
 
 class RegistryClientError(Exception):
@@ -19,37 +24,75 @@ class ConditionalCheckError(Exception):
     pass
 
 
-def db_connector(func):
-    def with_connection_(*args, **kwargs):
+def _connection_args(is_offline: bool) -> dict:
+    """
+    Return the boto3 connection arguments for DynamoDB.
+    If is_offline is set, then connect to the local instance of DynamoDB
+    running in Docker; Otherwise, connect to the cloud service.
+    (Note: moto mock DynamoDB uses this path, i.e. IS_OFFLINE is false.)
+    """
+    if is_offline:
+        logger.debug(f'DynamoDB: OFFLINE mode. Connecting to local db')
+        return {
+            'endpoint_url': 'http://dynamodb-local:8000/',
+            'region_name': 'us-west-2',
+            'aws_access_key_id': 'AWS_ACCESS_KEY_ID',
+            'aws_secret_access_key': 'AWS_SECRET_ACCESS_KEY'
+        }
+    logger.debug(f'DynamoDB: ONLINE mode. Connecting to cloud db.')
+    return {}
+
+
+# Low-level DynamoDB clients, keyed on IS_OFFLINE mode. Clients are safe to
+# share between threads (unlike boto3 resources); the lock makes sure each
+# is built only once.
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def _get_client(is_offline: bool):
+    """
+    Return a low-level DynamoDB client, creating it on first use. The client
+    does not (de)serialize attribute values, so they are passed in DynamoDB's
+    typed format.
+
+    Building a client loads the service model, so the client is cached and
+    reused across calls (and with it the underlying HTTP connection pool).
+    It is built from a session of its own, as boto3's default session is not
+    thread-safe.
+    """
+    client = _clients.get(is_offline)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(is_offline)
+            if client is None:
+                session = boto3.session.Session()
+                client = session.client("dynamodb",
+                                        **_connection_args(is_offline))
+                _clients[is_offline] = client
+    return client
+
+
+def db_client_connector(func):
+    def with_client_(*args, **kwargs):
 
         """
-        Open a connection to DynamoDB.
-        If IS_OFFLINE is set, then connect to the local instance of DynamoDB
-        running in Docker; Otherwise, connect to the cloud service.
-        (Note: moto mock DynamoDB uses this path, i.e. IS_OFFLINE is false.)
+        Pass a (cached) low-level DynamoDB client to func. Requests made
+        with it must name the table (TABLE_NAME) and pass attribute values
+        in DynamoDB's typed format.
         """
-        is_offline = os.environ.get("IS_OFFLINE")
+        is_offline = bool(os.environ.get("IS_OFFLINE"))
 
         try:
-            if is_offline:
-                logger.debug(f'DynamoDB: OFFLINE mode. Connecting to local db')
-                dynamodb = \
-                    boto3.resource(
-                        "dynamodb",
-                        endpoint_url='http://dynamodb-local:8000/',
-                        region_name='us-west-2',
-                        aws_access_key_id='AWS_ACCESS_KEY_ID',
-                        aws_secret_access_key='AWS_SECRET_ACCESS_KEY')
-            else:
-                logger.debug(f'DynamoDB: ONLINE mode. Connecting to cloud db.')
-                dynamodb = boto3.resource("dynamodb")
-            table = dynamodb.Table("bond")
-            logger.debug(f'DynamoDB: Connected to {table.table_arn}')
-            rv = func(table, *args, **kwargs)
+            rv = func(_get_client(is_offline), *args, **kwargs)
+        except ParamValidationError as err:
+            # the request was malformed; the database was never called.
+            logger.error("DynamoDB: Invalid request: %s" % err)
+            raise RegistryClientError(f"Invalid request: {str(err)}")
         except ClientError as err:
             logger.exception("DynamoDB: Failed to connect to the bond "
                              "table: %s" % err)
             raise RegistryClientError(f"Failed to connect to the database: "
                                       f"{str(err)}")
         return rv
-    return with_connection_
+    return with_client_
@@ -7,18 +7,21 @@ Available functions:
 - get_bonds: Return all bonds in the registry that match the search criteria.
 - get_bond: Return a specific bond.
 - create_bond: Create a bond.
+- bulk_create_bonds: Create (or overwrite) a batch of bonds.
 - update_bond: Update a bond.
 - delete_bond: Delete a bond.
 - add_subscriber: Add a subscriber to a bond.
 - remove_subscriber: Remove a subscriber from a bond.
 """
+from typing import List
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
 from registry import crud
 from registry import logger
-from registry.models import Bond, Subscriber
+from registry.models import Bond, BondRead, Subscriber
 from registry.db import ConditionalCheckError, RegistryClientError
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 
 
 @app.get("/health_check")
@@ -42,7 +45,9 @@ def health_check():
 @app.get("/bonds")
 def get_bonds(cost_center_id: str = None,
               account_id: str = None,
-              by_host: bool = True):
+              by_host: bool = True,
+              with_subscribers: bool = True,
+              raw: bool = False):
     """Return all bonds in the registry that match the search criteria.
 
     Args:
@@ -60,30 +65,47 @@ def get_bonds(cost_center_id: str = None,
         by_host (bool, Default=True): If by_host is true, filter on host cost
             center and/or account id; Otherwise, filter on subscriber cost
             center and/or account id.
+        with_subscribers (bool, Default=True): If false, the subscribers are
+            not fetched and the bonds are returned with empty subscribers.
+            Use this for listings that only need the bond details.
+        raw (bool, Default=False): If true, return the bonds exactly as they
+            are stored, skipping the Bond model. This is faster for large
+            result sets, but the bonds are not validated and bonds fetched
+            without subscribers have no subscribers field at all.
+
+    Raises:
+        HTTPException(400) if neither cost_center_id nor account_id is given.
 
     Returns:
         A list of bond objects or an empty list if none are found."""
     logger.info(f"Get bonds: cost_center_id={cost_center_id}, "
-                f"account_id={account_id}, by_host={by_host}")
+                f"account_id={account_id}, by_host={by_host}, "
+                f"with_subscribers={with_subscribers}, raw={raw}")
+    if cost_center_id is None and account_id is None:
+        raise HTTPException(status_code=400,
+                            detail="Either cost_center_id or account_id "
+                                   "is required.")
+    if account_id is not None:
+        attribute, value = "account_id", account_id
+    else:
+        attribute, value = "cost_center", cost_center_id
+    attribute = ("host_" if by_host else "sub_") + attribute
+
     try:
-        if by_host:
-            if account_id is not None:
-                bonds = crud.get_bonds_by_host_account_id(account_id)
-            else:
-                bonds = crud.get_bonds_by_host_cost_center(cost_center_id)
-        else:
-            if account_id is not None:
-                bonds = crud.get_bonds_by_sub_account_id(account_id)
-            else:
-                bonds = crud.get_bonds_by_sub_cost_center(cost_center_id)
+        if raw:
+            return ORJSONResponse(
+                crud.query_bonds_raw(attribute, value, with_subscribers))
+        bonds = crud.get_bonds_by_index(attribute, value, with_subscribers)
     except RegistryClientError as err:
         raise HTTPException(status_code=500, detail=str(err))
     return bonds
 
 
-@app.get("/bonds/{bond_id}", response_model=Bond)
-def get_bond(bond_id: str) -> Bond:
-    """Return a specific bond.
+@app.get("/bonds/{bond_id}", response_model=BondRead)
+def get_bond(bond_id: str) -> BondRead:
+    """Return a specific bond. The bond is returned as stored: it was
+    validated on the way in, so it is not built into a Bond (and its
+    subscribers into Subscribers) again.
 
     Args:
         bond_id (str): The bond id of the bond to fetch.
@@ -95,13 +117,15 @@ def get_bond(bond_id: str) -> Bond:
         The requested bond."""
     logger.info(f"Get bond: bond_id={bond_id}")
     try:
-        bond: Bond = crud.get_bond(bond_id)
+        item = crud.get_bond_raw(bond_id)
     except RegistryClientError as err:
         raise HTTPException(status_code=500, detail=str(err))
-    if bond is None:
+    if item is None:
         raise HTTPException(status_code=400,
                             detail=f"Bond {bond_id} not found.")
-    return bond
+    # construct() takes the item as is; it is only read when serialized, so
+    # sharing it with the bond cache is safe.
+    return BondRead.construct(**item)
 
 
 @app.post("/bonds/", response_model=Bond)
@@ -126,6 +150,23 @@ def create_bond(bond: Bond) -> Bond:
     return new_bond
 
 
+@app.post("/bonds/bulk", response_model=List[Bond])
+def bulk_create_bonds(bonds: List[Bond]) -> List[Bond]:
+    """Create a batch of bonds. Bonds that already exist are overwritten.
+
+    Args:
+        bonds (list): The bond objects to insert.
+
+    Returns:
+        The bonds created."""
+    logger.info(f"Bulk create bonds: count={len(bonds)}")
+    try:
+        new_bonds = crud.bulk_create_bonds(bonds)
+    except RegistryClientError as err:
+        raise HTTPException(status_code=500, detail=str(err))
+    return new_bonds
+
+
 @app.put("/bonds/{bond_id}", response_model=Bond)
 def update_bond(bond_id: str, bond: Bond) -> Bond:
     """Update a bond. Only updates those fields that have changed.
@@ -141,13 +182,18 @@ def update_bond(bond_id: str, bond: Bond) -> Bond:
         The updated bond."""
     logger.info(f"Update bond: bond_id={bond_id}, bond={bond}")
 
-    # find the existing bond and overwrite only the changed values
+    # find the existing bond and overwrite only the changed values. Read it
+    # from the database, not the cache, so as not to write back a stale copy.
     try:
-        stored_bond: Bond = crud.get_bond(bond_id)
+        stored_bond: Bond = crud.get_bond(bond_id, use_cache=False)
         if stored_bond is None:
             raise HTTPException(status_code=400,
                                 detail=f"Bond {bond_id} not found.")
-        update_data = bond.dict(exclude_unset=True)
+        # take the fields set on the request as-is: bond.dict() would walk
+        # the model and turn the subscribers back into plain dicts. Neither
+        # bond has to be re-validated as copy() does not validate.
+        update_data = {field: getattr(bond, field)
+                       for field in bond.__fields_set__}
         updated_bond = stored_bond.copy(update=update_data)
 
         new_bond = crud.update_bond(updated_bond)
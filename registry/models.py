@@ -1,8 +1,12 @@
+import re
 from typing import Dict
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, Extra, Field, validator
+from pydantic.errors import EmailError
 
 from registry import logger
 
+_EMAIL_RE = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+
 
 class Subscriber(BaseModel):
     """Represents a subscriber.
@@ -14,11 +18,18 @@ class Subscriber(BaseModel):
     Public attributes:
     - sid (str): The subscriber unique identifier.
     - name (str): The name of the subscriber.
-    - email (pydantic EmailStr): The email address of the subscriber.
+    - email (str): The email address of the subscriber.
     """
     sid: str
     name: str
-    email: EmailStr
+    email: str
+
+    @validator("email")
+    def email_is_valid(cls, v):
+        """Check the email address is of the form local@domain.tld."""
+        if not _EMAIL_RE.fullmatch(v):
+            raise EmailError()
+        return v
 
 
 class Bond(BaseModel):
@@ -50,7 +61,28 @@ class Bond(BaseModel):
     sub_account_id: str
     host_cost_center: str
     sub_cost_center: str
-    subscribers: Dict[str, Subscriber] = {}
+    subscribers: Dict[str, Subscriber] = Field(default_factory=dict)
+
+    class Config:
+        # add_subscriber/remove_subscriber mutate the subscribers in place;
+        # do not re-validate the bond on assignment.
+        validate_assignment = False
+        extra = Extra.ignore
+
+    @classmethod
+    def from_trusted(cls, data: dict) -> "Bond":
+        """Build a bond from data that has already been validated, e.g. an
+        item read back from the registry, skipping pydantic validation.
+        Do not use this for input that has not been validated.
+
+        Args:
+            data (dict): The bond attributes, with the subscribers as a dict
+                of subscriber attribute dicts keyed on subscriber id (sid).
+        """
+        fields = {k: v for k, v in data.items() if k != "subscribers"}
+        subscribers = {sid: Subscriber.construct(**sub)
+                       for sid, sub in data.get("subscribers", {}).items()}
+        return cls.construct(subscribers=subscribers, **fields)
 
     def add_subscriber(self, sub: Subscriber) -> None:
         """Add a subscriber to the bond. Overwrite if the sub already exists.
@@ -58,7 +90,8 @@ class Bond(BaseModel):
         Args:
             sub (Subscriber): The subscriber object to add to the bond.
         """
-        logger.info(f"Adding subscriber '{sub}' to '{self}'")
+        logger.info("Adding subscriber '%s' to bond '%s'", sub.sid,
+                    self.bond_id)
         self.subscribers[sub.sid] = sub
 
     def remove_subscriber(self, sub_id: str) -> None:
@@ -68,5 +101,28 @@ class Bond(BaseModel):
         Args:
             sub_id (str): The subscriber unique identifier.
         """
-        logger.info(f"Removing subscriber with id '{sub_id}' from '{self}'")
+        logger.info("Removing subscriber with id '%s' from bond '%s'",
+                    sub_id, self.bond_id)
         self.subscribers.pop(sub_id, None)  # ignores the KeyError if not found
+
+
+class BondRead(BaseModel):
+    """A read-only view of a bond, used to return bonds from the registry.
+
+    Bonds were validated when they were written, so the subscribers are
+    passed through as plain dicts rather than re-built as Subscriber
+    objects. Use Bond for anything that modifies a bond.
+
+    Public attributes: as for Bond, except
+    - subscribers (dict): The bond subscribers, each as a dict of subscriber
+        attributes (keyed on subscriber id (sid)).
+    """
+    bond_id: str
+    host_account_id: str
+    sub_account_id: str
+    host_cost_center: str
+    sub_cost_center: str
+    subscribers: Dict[str, dict] = Field(default_factory=dict)
+
+    class Config:
+        extra = Extra.ignore
@@ -1,50 +1,205 @@
 import pytest
 import testcontainers.compose
 import requests
-import backoff
+from requests.adapters import HTTPAdapter
 import boto3
 from botocore.exceptions import ClientError
 import json
-from fastapi.encoders import jsonable_encoder
-from registry.models import Subscriber
+import os
+import time
+from filelock import FileLock
 
 COMPOSE_PATH = "./"
+STARTUP_TIMEOUT = 30  # seconds
+STARTUP_POLL_INTERVAL = 0.1  # seconds
 
+# The subscribers of the pre-loaded bonds, as stored in the table.
+SUBS_JSON = {
+    'eniesc200': {'sid': 'eniesc200', 'name': 'Ed', 'email': 'ed@mail.com'},
+    'tfomoo100': {'sid': 'tfomoo100', 'name': 'Tom', 'email': 'tom@snail.com'},
+    'bfoere300': {'sid': 'bfoere300', 'name': 'Bill', 'email': 'bill@mojo.com'}
+}
 
-@pytest.fixture(scope="module")
-def compose(request):
+# The pre-loaded bonds, written by load_bonds(). Do not modify them.
+BOND_ITEMS = [
+    {'bond_id': '6cc333cd',
+     'host_account_id': 'KYOT95889719595091',
+     'sub_account_id': 'NSSV61341208978885',
+     'host_cost_center': 'yellow',
+     'sub_cost_center': 'silver',
+     'subscribers': {}
+     }, {
+        'bond_id': 'bf66a510',
+        'host_account_id': 'HAEP29388232018739',
+        'sub_account_id': 'WZNH57184416064999',
+        'host_cost_center': 'yellow',
+        'sub_cost_center': 'white',
+        'subscribers': SUBS_JSON
+    }, {
+        'bond_id': '3f4436a3',
+        'host_account_id': 'BULG01950964065116',
+        'sub_account_id': 'PFUP24464317335973',
+        'host_cost_center': 'maroon',
+        'sub_cost_center': 'navy',
+        'subscribers': SUBS_JSON
+    }, {
+        'bond_id': '070840c5',
+        'host_account_id': 'LXJC36779030364939',
+        'sub_account_id': 'OYHE81882804630311',
+        'host_cost_center': 'maroon',
+        'sub_cost_center': 'olive',
+        'subscribers': SUBS_JSON
+    }, {
+        'bond_id': 'e6d9c05f',
+        'host_account_id': 'YHRH31548177246824',
+        'sub_account_id': 'QZUL57771567168857',
+        'host_cost_center': 'navy',
+        'sub_cost_center': 'aqua',
+        'subscribers': SUBS_JSON
+    }, {
+        'bond_id': 'deleteme',
+        'host_account_id': 'YHRH31548175555555',
+        'sub_account_id': 'QZUL57771567777777',
+        'host_cost_center': 'navy',
+        'sub_cost_center': 'aqua',
+        'subscribers': {}
+    }, {
+        'bond_id': 'eb5e729a',
+        'host_account_id': 'YHRH31548177246824',
+        'sub_account_id': 'EVJS54814803488145',
+        'host_cost_center': 'navy',
+        'sub_cost_center': 'orange',
+        'subscribers': {}
+    }, {
+        'bond_id': '2e545043',
+        'host_account_id': 'NAMD04758644119335',
+        'sub_account_id': 'BVOD03985622038101',
+        'host_cost_center': 'green',
+        'sub_cost_center': 'orange',
+        'subscribers': {}
+    }, {
+        'bond_id': '402206d5',
+        'host_account_id': 'ZGDX86819087481638',
+        'sub_account_id': 'CNUE67550266655258',
+        'host_cost_center': 'black',
+        'sub_cost_center': 'orange',
+        'subscribers': {}
+    }
+]
+
+
+class RunningStack:
+    """
+    Stands in for DockerCompose when the tests reuse containers that are
+    already running (BOND_REGISTRY_REUSE=1), e.g. ones started with
+    `make init`. The services are reached on the host ports published in
+    the docker compose file.
+    """
+    PORTS = {("bond-registry", 8080): 5000,
+             ("dynamodb-local", 8000): 8000}
+
+    def get_service_host(self, service: str, port: int) -> str:
+        return "localhost"
+
+    def get_service_port(self, service: str, port: int) -> int:
+        return self.PORTS[(service, port)]
+
+    def is_up(self) -> bool:
+        """Return True if the API is up and healthy."""
+        host = self.get_service_host("bond-registry", 8080)
+        port = self.get_service_port("bond-registry", 8080)
+        try:
+            r = requests.get(f"http://{host}:{port}/health_check",
+                             timeout=0.2)
+        except requests.exceptions.RequestException:
+            return False
+        return r.status_code == 200
+
+
+def run_dir(tmp_path_factory, worker_id):
+    """
+    A directory shared by all of the pytest-xdist workers in this test run
+    (the session's own temp directory when the tests are not distributed).
+    Used to coordinate the workers through lock files.
+    """
+    base = tmp_path_factory.getbasetemp()
+    return base if worker_id == "master" else base.parent
+
+
+def add_compose_users(users_file, n: int) -> int:
+    """
+    Add n to the count of workers using the containers and return the new
+    count. Call with the compose lock held.
+    """
+    count = int(users_file.read_text()) if users_file.is_file() else 0
+    count += n
+    users_file.write_text(str(count))
+    return count
+
+
+@pytest.fixture(scope="session")
+def compose(request, tmp_path_factory, worker_id):
     """
     Test fixture to launch the docker containers as per the docker compose
     file. It has a retry loop to ensure the containers are up before
-    releasing the tests.
+    releasing the tests. The containers are started once per test session
+    and shared by all of the integration test modules.
+
+    When the tests are distributed with pytest-xdist, the first worker to
+    get here starts the containers and the last one to finish stops them.
+
+    Set BOND_REGISTRY_REUSE=1 to run against containers that are already
+    up instead (falling back to starting them if the API does not answer).
+    Reused containers are left running, but the bond table in them is
+    dropped and re-created with the test data.
     """
+    if os.environ.get("BOND_REGISTRY_REUSE") == "1":
+        stack = RunningStack()
+        if stack.is_up():
+            print("Reusing running containers")
+            return stack
+
+    shared = run_dir(tmp_path_factory, worker_id)
+    lock = FileLock(str(shared / "compose.lock"))
+    users_file = shared / "compose.users"
+    compose = testcontainers.compose.DockerCompose(COMPOSE_PATH)
 
     def fin():
         """
         Tear down handler to bring down the containers once the tests have
         run to completion.
         """
-        print("Stopping containers")
-        compose.stop()
+        with lock:
+            if add_compose_users(users_file, -1) == 0:
+                print("Stopping containers")
+                compose.stop()
     request.addfinalizer(fin)
 
-    @backoff.on_exception(backoff.expo,
-                          requests.exceptions.RequestException,
-                          max_time=30)
     def is_up(app_host: str, app_port: str):
         """
-        Continually polls the containers with back-off until we get a
-        response back and we know the containers are up and running.
+        Polls the health check at a short, fixed interval until we get a
+        response back and we know the containers are up and running, or
+        until the deadline passes.
         The bond registry container depends on the dynamodb container
         (as per the docker-compose file) so we know that both containers
         are running if api returns a result.
         """
-        r = requests.get(f"http://{app_host}:{app_port}/docs")
-        assert r.status_code == 200
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while time.monotonic() < deadline:
+            try:
+                r = requests.get(f"http://{app_host}:{app_port}/health_check",
+                                 timeout=0.5)
+                if r.status_code == 200:
+                    return
+            except requests.exceptions.RequestException:
+                pass
+            time.sleep(STARTUP_POLL_INTERVAL)
+        raise RuntimeError(f"API did not start within {STARTUP_TIMEOUT}s")
 
-    print("Starting containers")
-    compose = testcontainers.compose.DockerCompose(COMPOSE_PATH)
-    compose.start()
+    with lock:
+        if add_compose_users(users_file, 1) == 1:
+            print("Starting containers")
+            compose.start()
 
     host = compose.get_service_host("bond-registry", 8080)
     port = compose.get_service_port("bond-registry", 8080)
@@ -52,7 +207,7 @@ def compose(request):
     return compose
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def api_url(compose):
     """
     Provide the URL to the API once the containers are up.
@@ -62,7 +217,20 @@ def api_url(compose):
     return f"{host}:{port}"
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
+def client():
+    """
+    Provide an HTTP session for calling the API. The session keeps its
+    connection to the API alive, so the tests share one connection rather
+    than opening a new one per request.
+    """
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+    yield session
+    session.close()
+
+
+@pytest.fixture(scope="session")
 def db_url(compose):
     """
     Provide the URL to dynamodb once the containers are up.
@@ -72,7 +240,7 @@ def db_url(compose):
     return f"{host}:{port}"
 
 
-@pytest.fixture(scope='module')
+@pytest.fixture(scope='session')
 def dynamodb(db_url):
     """
     Connect to the local dynamodb container.
@@ -90,99 +258,62 @@ def dynamodb(db_url):
     return resource
 
 
-@pytest.fixture(scope='module')
-def table(dynamodb):
-    """Create the mock bond table."""
+@pytest.fixture(scope='session')
+def table(dynamodb, tmp_path_factory, worker_id):
+    """
+    Create the bond table and load the test data (once per test run; the
+    pytest-xdist workers share the table).
+    """
     with open("./localdb/01-create-table.json") as read_file:
         table_def = json.load(read_file)
+    shared = run_dir(tmp_path_factory, worker_id)
+    ready = shared / "table.ready"
+    with FileLock(str(shared / "table.lock")):
+        table = dynamodb.Table(table_def['TableName'])
+        if ready.is_file():  # another worker got here first
+            return table
+        try:
+            # Containers reused from an earlier run still hold its table.
+            table.delete()
+            table.wait_until_not_exists()
+        except ClientError as err:
+            if err.response['Error']['Code'] != 'ResourceNotFoundException':
+                print(err)
+                raise err
+        try:
+            table = dynamodb.create_table(
+                TableName=table_def['TableName'],
+                BillingMode=table_def['BillingMode'],
+                KeySchema=table_def['KeySchema'],
+                AttributeDefinitions=table_def['AttributeDefinitions'],
+                GlobalSecondaryIndexes=table_def['GlobalSecondaryIndexes'])
+        except ClientError as err:
+            print(err)
+            raise err
+        load_bonds(table)
+        ready.touch()
+    return table
+
+
+@pytest.fixture
+def seed(table):
+    """
+    Reload the test data, undoing any changes made by earlier tests. Tests
+    that change the test data use this and are put in the "mutations"
+    xdist group, so they run one at a time on a single worker and a reload
+    never races another test's writes. Bonds created by a test are left in
+    place; tests must use bond ids and cost centers that are unique to them.
+    """
+    load_bonds(table)
+    yield table
+
+
+def load_bonds(table):
+    """Load the test data into the bond table."""
     try:
-        table = dynamodb.create_table(
-            TableName=table_def['TableName'],
-            BillingMode=table_def['BillingMode'],
-            KeySchema=table_def['KeySchema'],
-            AttributeDefinitions=table_def['AttributeDefinitions'],
-            GlobalSecondaryIndexes=table_def['GlobalSecondaryIndexes'])
-
-        """Pre-loaded DynamoDB table for get tests."""
-        subs = {
-            'eniesc200': Subscriber(sid='eniesc200',
-                                    name='Ed',
-                                    email='ed@mail.com'),
-            'tfomoo100': Subscriber(sid='tfomoo100',
-                                    name='Tom',
-                                    email='tom@snail.com'),
-            'bfoere300': Subscriber(sid='bfoere300',
-                                    name='Bill',
-                                    email='bill@mojo.com')
-        }
-        items = [
-            {'bond_id': '6cc333cd',
-             'host_account_id': 'KYOT95889719595091',
-             'sub_account_id': 'NSSV61341208978885',
-             'host_cost_center': 'yellow',
-             'sub_cost_center': 'silver',
-             'subscribers': {}
-             }, {
-                'bond_id': 'bf66a510',
-                'host_account_id': 'HAEP29388232018739',
-                'sub_account_id': 'WZNH57184416064999',
-                'host_cost_center': 'yellow',
-                'sub_cost_center': 'white',
-                'subscribers': jsonable_encoder(subs)
-            }, {
-                'bond_id': '3f4436a3',
-                'host_account_id': 'BULG01950964065116',
-                'sub_account_id': 'PFUP24464317335973',
-                'host_cost_center': 'maroon',
-                'sub_cost_center': 'navy',
-                'subscribers': jsonable_encoder(subs)
-            }, {
-                'bond_id': '070840c5',
-                'host_account_id': 'LXJC36779030364939',
-                'sub_account_id': 'OYHE81882804630311',
-                'host_cost_center': 'maroon',
-                'sub_cost_center': 'olive',
-                'subscribers': jsonable_encoder(subs)
-            }, {
-                'bond_id': 'e6d9c05f',
-                'host_account_id': 'YHRH31548177246824',
-                'sub_account_id': 'QZUL57771567168857',
-                'host_cost_center': 'navy',
-                'sub_cost_center': 'aqua',
-                'subscribers': jsonable_encoder(subs)
-            }, {
-                'bond_id': 'deleteme',
-                'host_account_id': 'YHRH31548175555555',
-                'sub_account_id': 'QZUL57771567777777',
-                'host_cost_center': 'navy',
-                'sub_cost_center': 'aqua',
-                'subscribers': {}
-            }, {
-                'bond_id': 'eb5e729a',
-                'host_account_id': 'YHRH31548177246824',
-                'sub_account_id': 'EVJS54814803488145',
-                'host_cost_center': 'navy',
-                'sub_cost_center': 'orange',
-                'subscribers': {}
-            }, {
-                'bond_id': '2e545043',
-                'host_account_id': 'NAMD04758644119335',
-                'sub_account_id': 'BVOD03985622038101',
-                'host_cost_center': 'green',
-                'sub_cost_center': 'orange',
-                'subscribers': {}
-            }, {
-                'bond_id': '402206d5',
-                'host_account_id': 'ZGDX86819087481638',
-                'sub_account_id': 'CNUE67550266655258',
-                'host_cost_center': 'black',
-                'sub_cost_center': 'orange',
-                'subscribers': {}
-            }
-        ]
-        for r in items:
-            table.put_item(Item=r)
+        with table.batch_writer() as batch:
+            for r in BOND_ITEMS:
+                batch.put_item(Item=r)
     except ClientError as err:
         print(err)
         raise err
-    yield table
@@ -0,0 +1,212 @@
+import pytest
+import os
+import json
+import copy
+import boto3
+from moto import mock_dynamodb2
+from moto.dynamodb2.models import dynamodb_backends
+from fastapi.encoders import jsonable_encoder
+
+# Give each pytest-xdist worker a table of its own. This has to be set
+# before the registry is imported, as it reads the table name on import.
+os.environ.setdefault(
+    'TABLE_NAME',
+    f"bond_{os.environ.get('PYTEST_XDIST_WORKER', 'master')}")
+
+from registry.db import TABLE_NAME  # noqa: E402
+from registry.models import Subscriber  # noqa: E402
+from registry import crud  # noqa: E402
+
+"""
+Fixtures shared by the unit tests: a mock DynamoDB holding the bond table,
+with and without pre-loaded test data.
+"""
+
+# The subscribers of the bonds in populated_table.
+_POPULATED_SUBS = {
+    'eniesc200': Subscriber(sid='eniesc200',
+                            name='Ed',
+                            email='ed@mail.com'),
+    'tfomoo100': Subscriber(sid='tfomoo100',
+                            name='Tom',
+                            email='tom@snail.com'),
+    'bfoere300': Subscriber(sid='bfoere300',
+                            name='Bill',
+                            email='bill@mojo.com'),
+    'yonou100': Subscriber(sid='yonou100',
+                           name='Yofo',
+                           email='yofu@yosuysg.com'),
+    'vdingdo200': Subscriber(sid='vdingdo200',
+                             name='Vince',
+                             email='vinn@mojo.com'),
+    'terfo000': Subscriber(sid='terfo000',
+                           name='Bob',
+                           email='bob@mojo.com'),
+    'ming007': Subscriber(sid='ming007',
+                          name='Ming',
+                          email='emp@ming.com')
+}
+
+
+def empty_table(table):
+    """Delete every item in the table, and clear the bond cache."""
+    with table.batch_writer() as batch:
+        for item in table.scan(ProjectionExpression="bond_id")['Items']:
+            batch.delete_item(Key={'bond_id': item['bond_id']})
+    crud.bond_cache.clear()
+
+
+def populate_table(table):
+    """Load the test data for the get tests into an empty table."""
+    encoded_subs = jsonable_encoder(_POPULATED_SUBS)
+    items = [
+        {'bond_id': 'H0001-S0001',
+         'host_account_id': 'H0001',
+         'sub_account_id': 'S0001',
+         'host_cost_center': 'CC001',
+         'sub_cost_center': 'CC010',
+         'subscribers': {}
+         }, {
+         'bond_id': 'H0002-S0002',
+         'host_account_id': 'H0002',
+         'sub_account_id': 'S0002',
+         'host_cost_center': 'CC002',
+         'sub_cost_center': 'CC010',
+         'subscribers': encoded_subs
+         }, {
+         'bond_id': 'H0002-S0003',
+         'host_account_id': 'H0002',
+         'sub_account_id': 'S0003',
+         'host_cost_center': 'CC002',
+         'sub_cost_center': 'CC012',
+         'subscribers': encoded_subs
+         }, {
+         'bond_id': 'H0001-S0002',
+         'host_account_id': 'H0001',
+         'sub_account_id': 'S0002',
+         'host_cost_center': 'CC001',
+         'sub_cost_center': 'CC012',
+         'subscribers': encoded_subs
+         }, {
+         'bond_id': 'H0003-S0004',
+         'host_account_id': 'H0003',
+         'sub_account_id': 'S0004',
+         'host_cost_center': 'CC013',
+         'sub_cost_center': 'CC010',
+         'subscribers': encoded_subs
+         }
+    ]
+    with table.batch_writer() as batch:
+        for r in items:
+            batch.put_item(Item=r)
+
+
+@pytest.fixture(scope='session', autouse=True)
+def aws_credentials():
+    """Mocked AWS Credentials for moto."""
+    os.environ['AWS_ACCESS_KEY_ID'] = 'testing'
+    os.environ['AWS_SECRET_ACCESS_KEY'] = 'testing'
+    os.environ['AWS_SECURITY_TOKEN'] = 'testing'
+    os.environ['AWS_SESSION_TOKEN'] = 'testing'
+
+
+@pytest.fixture(scope='session', autouse=True)
+def _moto(aws_credentials):
+    """Mock DynamoDB for the whole session."""
+    with mock_dynamodb2():
+        yield
+
+
+@pytest.fixture(scope='session')
+def dynamodb(_moto):
+    """The mock DynamoDB, shared by all of the tests in the session."""
+    return boto3.resource('dynamodb', region_name='us-east-1')
+
+
+@pytest.fixture(scope='session')
+def table_def():
+    """The bond table definition, as used to create the real table."""
+    with open("./localdb/01-create-table.json") as read_file:
+        return json.load(read_file)
+
+
+def create_table(dynamodb, table_def, with_indexes=False):
+    """
+    Create the mock bond table. The secondary indexes are only built if
+    with_indexes is set, as only the get-by-index tests query them.
+    """
+    if with_indexes:
+        return dynamodb.create_table(
+            TableName=TABLE_NAME,
+            BillingMode=table_def['BillingMode'],
+            KeySchema=table_def['KeySchema'],
+            AttributeDefinitions=table_def['AttributeDefinitions'],
+            GlobalSecondaryIndexes=table_def['GlobalSecondaryIndexes'])
+    keys = {key['AttributeName'] for key in table_def['KeySchema']}
+    return dynamodb.create_table(
+        TableName=TABLE_NAME,
+        BillingMode=table_def['BillingMode'],
+        KeySchema=table_def['KeySchema'],
+        AttributeDefinitions=[a for a in table_def['AttributeDefinitions']
+                              if a['AttributeName'] in keys])
+
+
+@pytest.fixture(scope='session')
+def table(dynamodb, table_def):
+    """
+    Create the mock bond table, without its secondary indexes (once per
+    test session, i.e. once per pytest-xdist worker). The table is named
+    for the worker.
+    """
+    yield create_table(dynamodb, table_def)
+
+
+@pytest.fixture
+def clean_table(table):
+    """Empty the mock bond table, and the bond cache, before the test."""
+    empty_table(table)
+    yield table
+
+
+def _moto_tables(dynamodb):
+    """Return moto's tables for the region of the dynamodb resource."""
+    return dynamodb_backends[dynamodb.meta.client.meta.region_name].tables
+
+
+@pytest.fixture(scope='session')
+def populated_snapshot(table, dynamodb):
+    """
+    A copy of moto's state of the bond table once it has been loaded with
+    the test data (the table itself is left empty).
+    """
+    populate_table(table)
+    snapshot = copy.deepcopy(_moto_tables(dynamodb)[TABLE_NAME])
+    empty_table(table)
+    return snapshot
+
+
+@pytest.fixture
+def populated_table(clean_table, dynamodb, populated_snapshot):
+    """
+    Pre-loaded DynamoDB table for tests that also write to it. Rather than
+    loading the test data again, a fresh copy of the loaded table is
+    swapped into moto.
+    """
+    _moto_tables(dynamodb)[TABLE_NAME] = copy.deepcopy(populated_snapshot)
+    yield clean_table
+
+
+@pytest.fixture(scope='module')
+def populated_table_with_gsi(table, dynamodb, table_def):
+    """
+    Pre-loaded DynamoDB table, with its secondary indexes, for get tests.
+    It replaces the session table for the test module, and is loaded once,
+    so the tests using it must not write to it.
+    """
+    table.delete()
+    crud.bond_cache.clear()
+    indexed_table = create_table(dynamodb, table_def, with_indexes=True)
+    populate_table(indexed_table)
+    yield indexed_table
+    indexed_table.delete()
+    create_table(dynamodb, table_def)
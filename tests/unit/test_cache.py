@@ -0,0 +1,71 @@
+import pytest
+
+from registry.cache import TTLCache
+
+"""
+TTLCache tests, e.g. expiry, eviction and invalidation of entries.
+"""
+
+
+@pytest.fixture
+def cache():
+    """Returns an empty cache with room for two entries"""
+    return TTLCache(maxsize=2, ttl=60)
+
+
+def test_get_missing(cache):
+    """Get a key that was never cached"""
+    assert cache.get('foo') is None
+
+
+def test_put_and_get(cache):
+    """Get a key that was cached"""
+    cache.put('foo', 1)
+    assert cache.get('foo') == 1
+
+
+def test_expired(cache, monkeypatch):
+    """An entry past its time-to-live is not returned"""
+    cache.put('foo', 1)
+    monkeypatch.setattr('registry.cache.time.monotonic',
+                        lambda: float('inf'))
+    assert cache.get('foo') is None
+
+
+def test_evicts_least_recently_used(cache):
+    """Adding an entry to a full cache evicts the least recently used one"""
+    cache.put('foo', 1)
+    cache.put('bar', 2)
+    cache.get('foo')  # bar is now the least recently used
+    cache.put('baz', 3)
+    assert cache.get('foo') == 1
+    assert cache.get('bar') is None
+    assert cache.get('baz') == 3
+
+
+def test_pop(cache):
+    """Remove an entry, and ignore removing one that is not there"""
+    cache.put('foo', 1)
+    cache.pop('foo')
+    cache.pop('bar')
+    assert cache.get('foo') is None
+
+
+def test_clear(cache):
+    """Remove all entries"""
+    cache.put('foo', 1)
+    cache.put('bar', 2)
+    cache.clear()
+    assert cache.get('foo') is None
+    assert cache.get('bar') is None
+
+
+def test_put_after_invalidation(cache):
+    """A value read before an entry was invalidated is not cached"""
+    generation = cache.generation()
+    cache.pop('foo')  # a write completes while 'foo' is being read
+    cache.put('foo', 1, generation)
+    assert cache.get('foo') is None
+
+    cache.put('foo', 1, cache.generation())
+    assert cache.get('foo') == 1
@@ -1,46 +1,56 @@
 import pytest
-import os
-import json
-import boto3
-from boto3.dynamodb.conditions import Key
-from moto import mock_dynamodb2
+from botocore.exceptions import ClientError
 from fastapi.encoders import jsonable_encoder
 
 from registry.models import Bond, Subscriber
-from registry.db import ConditionalCheckError
-from registry import crud
-
-
-@pytest.fixture(scope='function')
-def aws_credentials():
-    """Mocked AWS Credentials for moto."""
-    os.environ['AWS_ACCESS_KEY_ID'] = 'testing'
-    os.environ['AWS_SECRET_ACCESS_KEY'] = 'testing'
-    os.environ['AWS_SECURITY_TOKEN'] = 'testing'
-    os.environ['AWS_SESSION_TOKEN'] = 'testing'
-
-
-@pytest.fixture(scope='function')
-def dynamodb(aws_credentials):
-    with mock_dynamodb2():
-        yield boto3.resource('dynamodb', region_name='us-east-1')
-
-
-@pytest.fixture(scope='function')
-def table(dynamodb):
-    """Create the mock bond table."""
-    with open("./localdb/01-create-table.json") as read_file:
-        table_def = json.load(read_file)
-    table = dynamodb.create_table(
-        TableName=table_def['TableName'],
-        BillingMode=table_def['BillingMode'],
-        KeySchema=table_def['KeySchema'],
-        AttributeDefinitions=table_def['AttributeDefinitions'],
-        GlobalSecondaryIndexes=table_def['GlobalSecondaryIndexes'])
-    yield table
+from registry.db import ConditionalCheckError, RegistryClientError
+from registry import crud, db
+
+# Every test starts from an empty table (see conftest.py).
+pytestmark = pytest.mark.usefixtures("clean_table")
+
+# The subscribers of bond_with_subs.
+_SUBS = {
+    'eniesc200': Subscriber(sid='eniesc200',
+                            name='Ed',
+                            email='ed@mail.com'),
+    'tfomoo100': Subscriber(sid='tfomoo100',
+                            name='Tom',
+                            email='tom@snail.com'),
+    'bfoere300': Subscriber(sid='bfoere300',
+                            name='Bill',
+                            email='bill@mojo.com')
+}
+
+# Subscribers added to bonds by the tests. The second overwrites Tom in
+# bond_with_subs.
+_JBOJO_SUB = Subscriber(sid='jbojo', name='Joe Bojo', email='bogo@mail.com')
+_TOM_OVERWRITE_SUB = Subscriber(sid='tfomoo100', name='Foo',
+                                email='buzz@mail.com')
+
+# The bond attributes other than its subscribers.
+FIELDS = ('bond_id', 'host_account_id', 'sub_account_id',
+          'host_cost_center', 'sub_cost_center')
+
+
+def _expected(bond):
+    """Return the FIELDS of bond, to compare to a stored item."""
+    return {k: getattr(bond, k) for k in FIELDS}
+
+
+def _seed_bond(table, bond, encoded_subs=None):
+    """Write a bond straight to the table, bypassing the registry."""
+    table.put_item(Item={
+        'bond_id': bond.bond_id,
+        'host_account_id': bond.host_account_id,
+        'sub_account_id': bond.sub_account_id,
+        'host_cost_center': bond.host_cost_center,
+        'sub_cost_center': bond.sub_cost_center,
+        'subscribers': encoded_subs or {}
+    })
 
 
-@pytest.fixture
+@pytest.fixture(scope='module')
 def bond_no_subs():
     """Returns a Bond with no subscribers"""
     return Bond(bond_id='HostAcctA-SubAcctB',
@@ -50,140 +60,56 @@ def bond_no_subs():
                 sub_cost_center='SubCostCenterB')
 
 
-@pytest.fixture
+@pytest.fixture(scope='module')
 def bond_with_subs():
     """Return a Bond with an existing set of subscribers"""
-    subs = {
-            'eniesc200': Subscriber(sid='eniesc200',
-                                    name='Ed',
-                                    email='ed@mail.com'),
-            'tfomoo100': Subscriber(sid='tfomoo100',
-                                    name='Tom',
-                                    email='tom@snail.com'),
-            'bfoere300': Subscriber(sid='bfoere300',
-                                    name='Bill',
-                                    email='bill@mojo.com')
-    }
     return Bond(bond_id='HostAcctA-SubAcctB',
                 host_account_id='HostAcctA',
                 sub_account_id='SubAcctB',
                 host_cost_center='HostCostCenterA',
                 sub_cost_center='SubCostCenterB',
-                subscribers=subs)
-
-
-@pytest.fixture(scope='function')
-def populated_table(table):
-    """Pre-loaded DynamoDB table for get tests."""
-    subs = {
-            'eniesc200': Subscriber(sid='eniesc200',
-                                    name='Ed',
-                                    email='ed@mail.com'),
-            'tfomoo100': Subscriber(sid='tfomoo100',
-                                    name='Tom',
-                                    email='tom@snail.com'),
-            'bfoere300': Subscriber(sid='bfoere300',
-                                    name='Bill',
-                                    email='bill@mojo.com'),
-            'yonou100': Subscriber(sid='yonou100',
-                                   name='Yofo',
-                                   email='yofu@yosuysg.com'),
-            'vdingdo200': Subscriber(sid='vdingdo200',
-                                     name='Vince',
-                                     email='vinn@mojo.com'),
-            'terfo000': Subscriber(sid='terfo000',
-                                   name='Bob',
-                                   email='bob@mojo.com'),
-            'ming007': Subscriber(sid='ming007',
-                                  name='Ming',
-                                  email='emp@ming.com')
-    }
-    items = [
-        {'bond_id': 'H0001-S0001',
-         'host_account_id': 'H0001',
-         'sub_account_id': 'S0001',
-         'host_cost_center': 'CC001',
-         'sub_cost_center': 'CC010',
-         'subscribers': {}
-         }, {
-         'bond_id': 'H0002-S0002',
-         'host_account_id': 'H0002',
-         'sub_account_id': 'S0002',
-         'host_cost_center': 'CC002',
-         'sub_cost_center': 'CC010',
-         'subscribers': jsonable_encoder(subs)
-         }, {
-         'bond_id': 'H0002-S0003',
-         'host_account_id': 'H0002',
-         'sub_account_id': 'S0003',
-         'host_cost_center': 'CC002',
-         'sub_cost_center': 'CC012',
-         'subscribers': jsonable_encoder(subs)
-         }, {
-         'bond_id': 'H0001-S0002',
-         'host_account_id': 'H0001',
-         'sub_account_id': 'S0002',
-         'host_cost_center': 'CC001',
-         'sub_cost_center': 'CC012',
-         'subscribers': jsonable_encoder(subs)
-         }, {
-         'bond_id': 'H0003-S0004',
-         'host_account_id': 'H0003',
-         'sub_account_id': 'S0004',
-         'host_cost_center': 'CC013',
-         'sub_cost_center': 'CC010',
-         'subscribers': jsonable_encoder(subs)
-         }
-    ]
-    for r in items:
-        table.put_item(Item=r)
-    yield table
+                subscribers=dict(_SUBS))
+
+
+@pytest.fixture(scope='module')
+def bond_with_subs_encoded(bond_with_subs):
+    """The bond_with_subs subscribers, encoded as they are stored."""
+    return jsonable_encoder(bond_with_subs.subscribers)
 
 
 def test_add_bond_no_subs(table, bond_no_subs):
     """Add a bond to DynamoDB without subscribers"""
     bond = crud.create_bond(bond_no_subs)
-    response = table.query(
-        ProjectionExpression="bond_id, subscribers",
-        KeyConditionExpression=Key('bond_id').eq('HostAcctA-SubAcctB')
-        )
+    response = table.get_item(
+        Key={'bond_id': 'HostAcctA-SubAcctB'},
+        ProjectionExpression="bond_id, subscribers"
+    )
     # print(response)
-    assert bond.subscribers.__len__() == 0
-    assert response.get("Count") == 1
-    items = response.get("Items")
-    assert len(items[0]["subscribers"]) == 0
+    assert len(bond.subscribers) == 0
+    item = response.get("Item")
+    assert item is not None
+    assert len(item["subscribers"]) == 0
 
 
 def test_add_bond(table, bond_with_subs):
     """Add a bond to DynamoDB with subscribers"""
     bond = crud.create_bond(bond_with_subs)
-    response = table.query(
+    response = table.get_item(
+        Key={'bond_id': 'HostAcctA-SubAcctB'},
         ProjectionExpression="bond_id, host_account_id, sub_account_id, "
-                             "host_cost_center, sub_cost_center, subscribers",
-        KeyConditionExpression=Key('bond_id').eq('HostAcctA-SubAcctB')
-        )
+                             "host_cost_center, sub_cost_center, subscribers"
+    )
     # print(response)
-    assert bond.subscribers.__len__() == 3
-    assert response.get("Count") == 1
-    items = response.get("Items")
-    assert items[0]["bond_id"] == 'HostAcctA-SubAcctB'
-    assert items[0]["host_account_id"] == 'HostAcctA'
-    assert items[0]["sub_account_id"] == 'SubAcctB'
-    assert items[0]["host_cost_center"] == 'HostCostCenterA'
-    assert items[0]["sub_cost_center"] == 'SubCostCenterB'
-    assert len(items[0]["subscribers"]) == 3
+    assert len(bond.subscribers) == 3
+    item = response.get("Item")
+    assert item is not None
+    assert {k: item[k] for k in FIELDS} == _expected(bond_with_subs)
+    assert len(item["subscribers"]) == 3
 
 
 def test_add_bond_already_exists(table, bond_no_subs):
     """Add a bond that already exists in DynamoDB. It will raise an error."""
-    table.put_item(Item={
-                    'bond_id': bond_no_subs.bond_id,
-                    'host_account_id': bond_no_subs.host_account_id,
-                    'sub_account_id': bond_no_subs.sub_account_id,
-                    'host_cost_center': bond_no_subs.host_cost_center,
-                    'sub_cost_center': bond_no_subs.sub_cost_center,
-                    'subscribers': {}
-                    })
+    _seed_bond(table, bond_no_subs)
 
     # create a new bond that shares the same partition key as the one
     # we just inserted.
@@ -198,34 +124,118 @@ def test_add_bond_already_exists(table, bond_no_subs):
         crud.create_bond(new_bond)
 
     # make sure the original bond is untouched.
-    response = table.query(
+    response = table.get_item(
+        Key={'bond_id': 'HostAcctA-SubAcctB'},
         ProjectionExpression="bond_id, host_account_id, sub_account_id, "
-                             "host_cost_center, sub_cost_center, subscribers",
-        KeyConditionExpression=Key('bond_id').eq('HostAcctA-SubAcctB')
+                             "host_cost_center, sub_cost_center, subscribers"
     )
     # print(response)
 
     # assert the original bond is still there and untouched.
-    assert response.get("Count") == 1
-    items = response.get("Items")
-    assert items[0]["bond_id"] == bond_no_subs.bond_id
-    assert items[0]["host_account_id"] == bond_no_subs.host_account_id
-    assert items[0]["sub_account_id"] == bond_no_subs.sub_account_id
-    assert items[0]["host_cost_center"] == bond_no_subs.host_cost_center
-    assert items[0]["sub_cost_center"] == bond_no_subs.sub_cost_center
-    assert len(items[0]["subscribers"]) == 0
+    item = response.get("Item")
+    assert item is not None
+    assert {k: item[k] for k in FIELDS} == _expected(bond_no_subs)
+    assert len(item["subscribers"]) == 0
+
+
+def test_bulk_create_bonds(table, bond_no_subs, bond_with_subs):
+    """Add a batch of bonds to DynamoDB."""
+    other_bond = Bond(bond_id='HostAcctC-SubAcctD',
+                      host_account_id='HostAcctC',
+                      sub_account_id='SubAcctD',
+                      host_cost_center='HostCostCenterC',
+                      sub_cost_center='SubCostCenterD',
+                      subscribers=bond_with_subs.subscribers)
+    bonds = crud.bulk_create_bonds([bond_no_subs, other_bond])
+    assert len(bonds) == 2
+
+    response = table.scan()
+    assert response.get("Count") == 2
+    items = {item["bond_id"]: item for item in response.get("Items")}
+    assert len(items['HostAcctA-SubAcctB']["subscribers"]) == 0
+    item = items['HostAcctC-SubAcctD']
+    assert {k: item[k] for k in FIELDS} == _expected(other_bond)
+    assert len(item["subscribers"]) == 3
+
+
+def _many_bonds(n, sub_cost_center='CC010'):
+    """Returns n bonds with no subscribers."""
+    return [Bond(bond_id=f'H{i:04}-S{i:04}',
+                 host_account_id=f'H{i:04}',
+                 sub_account_id=f'S{i:04}',
+                 host_cost_center='CC001',
+                 sub_cost_center=sub_cost_center) for i in range(n)]
+
+
+def test_bulk_create_bonds_many(table):
+    """
+    Add more bonds than fit in a single batch request. A bond id given
+    twice is written once, with the last bond's values.
+    """
+    bonds = _many_bonds(30)
+    bonds.append(bonds[0].copy(update={'sub_cost_center': 'CC099'}))
+    crud.bulk_create_bonds(bonds)
 
+    items = table.scan()['Items']
+    assert len(items) == 30
+    item = [item for item in items if item['bond_id'] == 'H0000-S0000'][0]
+    assert item['sub_cost_center'] == 'CC099'
 
-def test_update_bond(table, bond_with_subs):
+
+def test_bulk_create_bonds_failed_batch(table, monkeypatch):
+    """
+    A batch fails after an earlier one was written. The bonds written are
+    not served stale from the cache.
+    """
+    crud.bulk_create_bonds(_many_bonds(1))
+    crud.get_bond('H0000-S0000')  # caches the bond
+
+    client = db._get_client(False)
+    batch_write_item = client.batch_write_item
+    calls = []
+
+    def fail_second_batch(**kwargs):
+        calls.append(kwargs)
+        if len(calls) == 2:
+            raise ClientError({'Error': {'Code': 'InternalServerError'}},
+                              'BatchWriteItem')
+        return batch_write_item(**kwargs)
+
+    monkeypatch.setattr(client, 'batch_write_item', fail_second_batch)
+    with pytest.raises(RegistryClientError):
+        crud.bulk_create_bonds(_many_bonds(30, sub_cost_center='CC099'))
+
+    assert crud.get_bond('H0000-S0000').sub_cost_center == 'CC099'
+
+
+def test_bulk_create_bonds_throttled(table, monkeypatch):
+    """
+    The registry keeps returning unprocessed writes. They are retried with
+    a growing backoff, then it will raise a RegistryClientError.
+    """
+    client = db._get_client(False)
+    calls = []
+    sleeps = []
+
+    def throttle(RequestItems):
+        calls.append(RequestItems)
+        return {'UnprocessedItems': RequestItems}
+
+    monkeypatch.setattr(client, 'batch_write_item', throttle)
+    monkeypatch.setattr(crud.random, 'uniform', lambda low, high: high)
+    monkeypatch.setattr(crud.time, 'sleep', sleeps.append)
+    with pytest.raises(RegistryClientError) as e:
+        crud.bulk_create_bonds(_many_bonds(3))
+
+    assert len(calls) == crud._BATCH_MAX_ATTEMPTS
+    assert "3 bonds" in str(e.value)
+    assert sleeps == sorted(sleeps)
+    assert len(sleeps) == crud._BATCH_MAX_ATTEMPTS - 1
+
+
+def test_update_bond(table, bond_with_subs, bond_with_subs_encoded):
     """Update a bond with changed values and adding a new subscriber."""
-    table.put_item(Item={
-                    'bond_id': bond_with_subs.bond_id,
-                    'host_account_id': bond_with_subs.host_account_id,
-                    'sub_account_id': bond_with_subs.sub_account_id,
-                    'host_cost_center': bond_with_subs.host_cost_center,
-                    'sub_cost_center': bond_with_subs.sub_cost_center,
-                    'subscribers': jsonable_encoder(bond_with_subs.subscribers)
-                    })
+    _seed_bond(table, bond_with_subs, bond_with_subs_encoded)
 
     # create the same bond with updated values and with a new subscriber
     upd_bond = Bond(bond_id=bond_with_subs.bond_id,
@@ -234,27 +244,21 @@ def test_update_bond(table, bond_with_subs):
                     host_cost_center='Fuz',
                     sub_cost_center='Boo',
                     subscribers=bond_with_subs.subscribers)
-    upd_bond.add_subscriber(Subscriber(sid='jbojo',
-                                       name='Joe Bojo',
-                                       email='bogo@mail.com'))
+    upd_bond.add_subscriber(_JBOJO_SUB)
 
     # update the bond
     bond = crud.update_bond(upd_bond)
-    response = table.query(
+    response = table.get_item(
+        Key={'bond_id': 'HostAcctA-SubAcctB'},
         ProjectionExpression="bond_id, host_account_id, sub_account_id, "
-                             "host_cost_center, sub_cost_center, subscribers",
-        KeyConditionExpression=Key('bond_id').eq('HostAcctA-SubAcctB')
-        )
+                             "host_cost_center, sub_cost_center, subscribers"
+    )
     # print(response)
-    assert bond.subscribers.__len__() == 4
-    assert response.get("Count") == 1
-    items = response.get("Items")
-    assert items[0]["bond_id"] == 'HostAcctA-SubAcctB'
-    assert items[0]["host_account_id"] == 'HostAcctA'
-    assert items[0]["sub_account_id"] == 'SubAcctB'
-    assert items[0]["host_cost_center"] == 'Fuz'
-    assert items[0]["sub_cost_center"] == 'Boo'
-    assert len(items[0]["subscribers"]) == 4
+    assert len(bond.subscribers) == 4
+    item = response.get("Item")
+    assert item is not None
+    assert {k: item[k] for k in FIELDS} == _expected(upd_bond)
+    assert len(item["subscribers"]) == 4
 
 
 def test_update_bond_not_exists(table, bond_no_subs):
@@ -265,35 +269,28 @@ def test_update_bond_not_exists(table, bond_no_subs):
         crud.update_bond(bond_no_subs)
 
     # make sure the bond has not been inserted.
-    response = table.query(
+    response = table.get_item(
+        Key={'bond_id': 'HostAcctA-SubAcctB'},
         ProjectionExpression="bond_id, host_account_id, sub_account_id, "
-                             "host_cost_center, sub_cost_center, subscribers",
-        KeyConditionExpression=Key('bond_id').eq('HostAcctA-SubAcctB')
+                             "host_cost_center, sub_cost_center, subscribers"
     )
     # print(response)
-    assert response.get("Count") == 0
+    assert 'Item' not in response
 
 
 def test_delete(table, bond_no_subs):
     """Delete a bond."""
-    table.put_item(Item={
-                    'bond_id': bond_no_subs.bond_id,
-                    'host_account_id': bond_no_subs.host_account_id,
-                    'sub_account_id': bond_no_subs.sub_account_id,
-                    'host_cost_center': bond_no_subs.host_cost_center,
-                    'sub_cost_center': bond_no_subs.sub_cost_center,
-                    'subscribers': {}
-                    })
+    _seed_bond(table, bond_no_subs)
     crud.delete_bond(bond_no_subs.bond_id)
 
     # make sure the bond has gone.
-    response = table.query(
+    response = table.get_item(
+        Key={'bond_id': 'HostAcctA-SubAcctB'},
         ProjectionExpression="bond_id, host_account_id, sub_account_id, "
-                             "host_cost_center, sub_cost_center, subscribers",
-        KeyConditionExpression=Key('bond_id').eq('HostAcctA-SubAcctB')
+                             "host_cost_center, sub_cost_center, subscribers"
     )
     # print(response)
-    assert response.get("Count") == 0
+    assert 'Item' not in response
 
 
 def test_delete_not_exists(table, bond_no_subs):
@@ -305,96 +302,67 @@ def test_add_subscriber_empty_bond(table, bond_no_subs):
     """
     Add a new subscriber to a bond with no current subscribers.
     """
-    table.put_item(Item={
-                    'bond_id': bond_no_subs.bond_id,
-                    'host_account_id': bond_no_subs.host_account_id,
-                    'sub_account_id': bond_no_subs.sub_account_id,
-                    'host_cost_center': bond_no_subs.host_cost_center,
-                    'sub_cost_center': bond_no_subs.sub_cost_center,
-                    'subscribers': {}
-                    })
-
-    crud.add_subscriber(bond_no_subs.bond_id,
-                        Subscriber(sid='jbojo',
-                                   name='Joe Bojo',
-                                   email='bogo@mail.com'))
+    _seed_bond(table, bond_no_subs)
+
+    crud.add_subscriber(bond_no_subs.bond_id, _JBOJO_SUB)
 
     # make sure the subscriber was added.
-    response = table.query(
+    response = table.get_item(
+        Key={'bond_id': bond_no_subs.bond_id},
         ProjectionExpression="bond_id, host_account_id, sub_account_id, "
-                             "host_cost_center, sub_cost_center, subscribers",
-        KeyConditionExpression=Key('bond_id').eq(bond_no_subs.bond_id)
+                             "host_cost_center, sub_cost_center, subscribers"
     )
-    assert response.get("Count") == 1
-    items = response.get("Items")
-    subs = items[0]["subscribers"]
+    item = response.get("Item")
+    assert item is not None
+    subs = item["subscribers"]
     assert len(subs) == 1
     assert subs['jbojo']['sid'] == 'jbojo'
     assert subs['jbojo']['name'] == 'Joe Bojo'
     assert subs['jbojo']['email'] == 'bogo@mail.com'
 
 
-def test_add_subscriber_full_bond(table, bond_with_subs):
+def test_add_subscriber_full_bond(table, bond_with_subs,
+                                  bond_with_subs_encoded):
     """
     Add a new subscriber to a bond that already has subscribers.
     """
-    table.put_item(Item={
-        'bond_id': bond_with_subs.bond_id,
-        'host_account_id': bond_with_subs.host_account_id,
-        'sub_account_id': bond_with_subs.sub_account_id,
-        'host_cost_center': bond_with_subs.host_cost_center,
-        'sub_cost_center': bond_with_subs.sub_cost_center,
-        'subscribers': jsonable_encoder(bond_with_subs.subscribers)
-    })
+    _seed_bond(table, bond_with_subs, bond_with_subs_encoded)
 
-    crud.add_subscriber(bond_with_subs.bond_id,
-                        Subscriber(sid='jbojo',
-                                   name='Joe Bojo',
-                                   email='bogo@mail.com'))
+    crud.add_subscriber(bond_with_subs.bond_id, _JBOJO_SUB)
 
     # make sure the subscriber was added.
-    response = table.query(
+    response = table.get_item(
+        Key={'bond_id': bond_with_subs.bond_id},
         ProjectionExpression="bond_id, host_account_id, sub_account_id, "
-                             "host_cost_center, sub_cost_center, subscribers",
-        KeyConditionExpression=Key('bond_id').eq(bond_with_subs.bond_id)
+                             "host_cost_center, sub_cost_center, subscribers"
     )
-    assert response.get("Count") == 1
-    items = response.get("Items")
-    subs = items[0]["subscribers"]
+    item = response.get("Item")
+    assert item is not None
+    subs = item["subscribers"]
     assert len(subs) == 4
     assert subs['jbojo']['sid'] == 'jbojo'
     assert subs['jbojo']['name'] == 'Joe Bojo'
     assert subs['jbojo']['email'] == 'bogo@mail.com'
 
 
-def test_add_subscriber_exists(table, bond_with_subs):
+def test_add_subscriber_exists(table, bond_with_subs, bond_with_subs_encoded):
     """
     Try to add a subscriber that is already listed in the bond. It will
     overwrite what was there, i.e. an update.
     """
-    table.put_item(Item={
-        'bond_id': bond_with_subs.bond_id,
-        'host_account_id': bond_with_subs.host_account_id,
-        'sub_account_id': bond_with_subs.sub_account_id,
-        'host_cost_center': bond_with_subs.host_cost_center,
-        'sub_cost_center': bond_with_subs.sub_cost_center,
-        'subscribers': jsonable_encoder(bond_with_subs.subscribers)
-    })
+    _seed_bond(table, bond_with_subs, bond_with_subs_encoded)
 
-    crud.add_subscriber(bond_with_subs.bond_id,
-                        Subscriber(sid='tfomoo100',
-                                   name='Foo',
-                                   email='buzz@mail.com'))
+    crud.add_subscriber(bond_with_subs.bond_id, _TOM_OVERWRITE_SUB)
 
     # make sure the subscriber was added.
-    response = table.query(
+    response = table.get_item(
+        Key={'bond_id': bond_with_subs.bond_id},
         ProjectionExpression="bond_id, host_account_id, sub_account_id, "
-                             "host_cost_center, sub_cost_center, subscribers",
-        KeyConditionExpression=Key('bond_id').eq(bond_with_subs.bond_id)
+                             "host_cost_center, sub_cost_center, subscribers"
     )
-    assert response.get("Count") == 1
-    items = response.get("Items")
-    subs = items[0]["subscribers"]
+    item = response.get("Item")
+    assert item is not None
+    subs = item["subscribers"]
     assert len(subs) == 3
     assert subs['tfomoo100']['sid'] == 'tfomoo100'
     assert subs['tfomoo100']['name'] == 'Foo'
@@ -407,10 +375,7 @@ def test_add_subscriber_no_bond(populated_table):
     It will throw a ConditionalCheckError as that bond does not exist.
     """
     with pytest.raises(ConditionalCheckError):
-        crud.add_subscriber("garbage",
-                            Subscriber(sid='jbojo',
-                                       name='Joe Bojo',
-                                       email='bogo@mail.com'))
+        crud.add_subscriber("garbage", _JBOJO_SUB)
 
 
 def test_remove_subscriber_empty_bond(table, bond_no_subs):
@@ -418,96 +383,65 @@ def test_remove_subscriber_empty_bond(table, bond_no_subs):
     Try to remove a subscriber from a bond with no current subscribers.
     Nothing will happen. The bond will not change.
     """
-    table.put_item(Item={
-        'bond_id': bond_no_subs.bond_id,
-        'host_account_id': bond_no_subs.host_account_id,
-        'sub_account_id': bond_no_subs.sub_account_id,
-        'host_cost_center': bond_no_subs.host_cost_center,
-        'sub_cost_center': bond_no_subs.sub_cost_center,
-        'subscribers': {}
-    })
+    _seed_bond(table, bond_no_subs)
 
     crud.remove_subscriber(bond_no_subs.bond_id, 'jbojo')
 
     # make sure the bond is untouched.
-    response = table.query(
+    response = table.get_item(
+        Key={'bond_id': bond_no_subs.bond_id},
         ProjectionExpression="bond_id, host_account_id, sub_account_id, "
-                             "host_cost_center, sub_cost_center, subscribers",
-        KeyConditionExpression=Key('bond_id').eq(bond_no_subs.bond_id)
+                             "host_cost_center, sub_cost_center, subscribers"
     )
-    assert response.get("Count") == 1
-    items = response.get("Items")
-    assert items[0]["bond_id"] == bond_no_subs.bond_id
-    assert items[0]["host_account_id"] == bond_no_subs.host_account_id
-    assert items[0]["sub_account_id"] == bond_no_subs.sub_account_id
-    assert items[0]["host_cost_center"] == bond_no_subs.host_cost_center
-    assert items[0]["sub_cost_center"] == bond_no_subs.sub_cost_center
-    assert len(items[0]["subscribers"]) == 0
+    item = response.get("Item")
+    assert item is not None
+    assert {k: item[k] for k in FIELDS} == _expected(bond_no_subs)
+    assert len(item["subscribers"]) == 0
 
 
-def test_remove_subscriber_full_bond(table, bond_with_subs):
+def test_remove_subscriber_full_bond(table, bond_with_subs,
+                                     bond_with_subs_encoded):
     """
     Remove a subscriber from a bond that contains that subscriber.
     """
-    table.put_item(Item={
-        'bond_id': bond_with_subs.bond_id,
-        'host_account_id': bond_with_subs.host_account_id,
-        'sub_account_id': bond_with_subs.sub_account_id,
-        'host_cost_center': bond_with_subs.host_cost_center,
-        'sub_cost_center': bond_with_subs.sub_cost_center,
-        'subscribers': jsonable_encoder(bond_with_subs.subscribers)
-    })
+    _seed_bond(table, bond_with_subs, bond_with_subs_encoded)
 
     crud.remove_subscriber(bond_with_subs.bond_id, 'bfoere300')
 
     # make sure the subscriber was removed.
-    response = table.query(
+    response = table.get_item(
+        Key={'bond_id': bond_with_subs.bond_id},
         ProjectionExpression="bond_id, host_account_id, sub_account_id, "
-                             "host_cost_center, sub_cost_center, subscribers",
-        KeyConditionExpression=Key('bond_id').eq(bond_with_subs.bond_id)
+                             "host_cost_center, sub_cost_center, subscribers"
     )
-    assert response.get("Count") == 1
-    items = response.get("Items")
-    assert items[0]["bond_id"] == bond_with_subs.bond_id
-    assert items[0]["host_account_id"] == bond_with_subs.host_account_id
-    assert items[0]["sub_account_id"] == bond_with_subs.sub_account_id
-    assert items[0]["host_cost_center"] == bond_with_subs.host_cost_center
-    assert items[0]["sub_cost_center"] == bond_with_subs.sub_cost_center
-    assert len(items[0]["subscribers"]) == 2
-    assert 'bfoere300' not in items[0]["subscribers"].keys()
-
-
-def test_remove_subscriber_full_bond_not_exists(table, bond_with_subs):
+    item = response.get("Item")
+    assert item is not None
+    assert {k: item[k] for k in FIELDS} == _expected(bond_with_subs)
+    assert len(item["subscribers"]) == 2
+    assert 'bfoere300' not in item["subscribers"].keys()
+
+
+def test_remove_subscriber_full_bond_not_exists(table, bond_with_subs,
+                                                bond_with_subs_encoded):
     """
     Remove a subscriber from a bond that contains subs, but not that one.
     Nothing will happen. The bond will not change.
     """
-    table.put_item(Item={
-        'bond_id': bond_with_subs.bond_id,
-        'host_account_id': bond_with_subs.host_account_id,
-        'sub_account_id': bond_with_subs.sub_account_id,
-        'host_cost_center': bond_with_subs.host_cost_center,
-        'sub_cost_center': bond_with_subs.sub_cost_center,
-        'subscribers': jsonable_encoder(bond_with_subs.subscribers)
-    })
+    _seed_bond(table, bond_with_subs, bond_with_subs_encoded)
 
     crud.remove_subscriber(bond_with_subs.bond_id, 'garbage')
 
     # make sure the subscriber was removed.
-    response = table.query(
+    response = table.get_item(
+        Key={'bond_id': bond_with_subs.bond_id},
         ProjectionExpression="bond_id, host_account_id, sub_account_id, "
-                             "host_cost_center, sub_cost_center, subscribers",
-        KeyConditionExpression=Key('bond_id').eq(bond_with_subs.bond_id)
+                             "host_cost_center, sub_cost_center, subscribers"
     )
-    assert response.get("Count") == 1
-    items = response.get("Items")
-    assert items[0]["bond_id"] == bond_with_subs.bond_id
-    assert items[0]["host_account_id"] == bond_with_subs.host_account_id
-    assert items[0]["sub_account_id"] == bond_with_subs.sub_account_id
-    assert items[0]["host_cost_center"] == bond_with_subs.host_cost_center
-    assert items[0]["sub_cost_center"] == bond_with_subs.sub_cost_center
-    assert len(items[0]["subscribers"]) == 3
-    assert 'garbage' not in items[0]["subscribers"].keys()
+    item = response.get("Item")
+    assert item is not None
+    assert {k: item[k] for k in FIELDS} == _expected(bond_with_subs)
+    assert len(item["subscribers"]) == 3
+    assert 'garbage' not in item["subscribers"].keys()
 
 
 def test_remove_subscriber_no_bond(populated_table):
@@ -519,101 +453,35 @@ def test_remove_subscriber_no_bond(populated_table):
         crud.remove_subscriber("garbage", 'jbojo')
 
 
-def test_get_bond(populated_table):
-    """Find a bond with the given bond id."""
-    bond = crud.get_bond('H0002-S0003')
-
-    assert bond.host_account_id == 'H0002'
-    assert bond.sub_account_id == 'S0003'
-    assert bond.host_cost_center == 'CC002'
-    assert bond.sub_cost_center == 'CC012'
-    assert len(bond.subscribers) == 7
-    assert bond.subscribers.get('eniesc200').sid == 'eniesc200'
-    assert bond.subscribers.get('eniesc200').name == 'Ed'
-    assert bond.subscribers.get('eniesc200').email == 'ed@mail.com'
-    assert bond.subscribers.get('tfomoo100').name == 'Tom'
-    assert bond.subscribers.get('bfoere300').name == 'Bill'
-    assert bond.subscribers.get('yonou100').name == 'Yofo'
-    assert bond.subscribers.get('vdingdo200').name == 'Vince'
-    assert bond.subscribers.get('terfo000').name == 'Bob'
-    assert bond.subscribers.get('ming007').name == 'Ming'
-
-
-def test_get_bond_not_found(populated_table):
-    """Get a bond that does not exist. None will be returned."""
-    bond = crud.get_bond('rhubarb')
-    assert bond is None
-
-
-def test_get_bond_by_host_cost_center(populated_table):
+def test_get_bond_cached(populated_table):
     """
-    Get all bonds for a given host cost center.
+    A bond that has been fetched is served from the cache until it is
+    written through the registry.
     """
-    bonds = crud.get_bonds_by_host_cost_center(host_cost_center='CC001')
-    assert len(bonds) == 2
-    assert 'H0001-S0001' in [bond.bond_id for bond in bonds]
-    assert 'H0001-S0002' in [bond.bond_id for bond in bonds]
+    bond = crud.get_bond('H0001-S0001')
+    populated_table.delete_item(Key={'bond_id': 'H0001-S0001'})
+    assert crud.get_bond('H0001-S0001').bond_id == bond.bond_id  # cached
 
+    bond.sub_cost_center = 'CC099'
+    crud.create_bond(bond)  # invalidates the cached bond
+    assert crud.get_bond('H0001-S0001').sub_cost_center == 'CC099'
 
-def test_get_bond_by_host_cost_center_not_found(populated_table):
-    """
-    Search for a host cost center that does not exist. Returns an empty list.
-    """
-    bonds = crud.get_bonds_by_host_cost_center(host_cost_center='Blah')
-    assert len(bonds) == 0
 
-
-def test_get_bond_by_host_account_id(populated_table):
-    """
-    Get all bonds for a given host account id.
-    """
-    bonds = crud.get_bonds_by_host_account_id(host_account_id="H0002")
-    assert len(bonds) == 2
-    assert 'H0002-S0002' in [bond.bond_id for bond in bonds]
-    assert 'H0002-S0003' in [bond.bond_id for bond in bonds]
-
-
-def test_get_bond_by_host_account_id_not_found(populated_table):
-    """
-    Search for a host account id that does not exist. Returns an empty list.
-    """
-    bonds = crud.get_bonds_by_host_account_id(host_account_id='Blah')
-    assert len(bonds) == 0
-
-
-def test_get_bond_by_sub_cost_center(populated_table):
+def test_get_bond_write_during_read(populated_table, monkeypatch):
     """
-    Get all bonds for a given subscriber cost center.
+    A bond read while the same process writes it is not cached, so the
+    write is seen at once.
     """
-    bonds = crud.get_bonds_by_sub_cost_center(sub_cost_center='CC010')
-    assert len(bonds) == 3
-    assert 'H0001-S0001' in [bond.bond_id for bond in bonds]
-    assert 'H0002-S0002' in [bond.bond_id for bond in bonds]
-    assert 'H0003-S0004' in [bond.bond_id for bond in bonds]
+    get_item = crud.get_item
 
+    def read_then_write(key):
+        item = get_item(key)  # the read returns the old bond...
+        bond = crud.bond_from_item(item)
+        bond.sub_cost_center = 'CC099'
+        crud.update_bond(bond)  # ...and a write completes before it caches
+        return item
 
-def test_get_bond_by_sub_cost_center_not_found(populated_table):
-    """
-    Search for a subscriber cost center that doesn't exist. Returns an empty
-    list.
-    """
-    bonds = crud.get_bonds_by_sub_cost_center(sub_cost_center='Blah')
-    assert len(bonds) == 0
-
-
-def test_get_bond_by_sub_account_id(populated_table):
-    """
-    Get all bonds for a given subscriber account id.
-    """
-    bonds = crud.get_bonds_by_sub_account_id(sub_account_id="S0004")
-    assert len(bonds) == 1
-    assert 'H0003-S0004' in [bond.bond_id for bond in bonds]
-
-
-def test_get_bond_by_sub_account_id_not_found(populated_table):
-    """
-    Search for a subscriber account id that doesn't exist. Returns an empty
-    list.
-    """
-    bonds = crud.get_bonds_by_sub_account_id(sub_account_id='Blah')
-    assert len(bonds) == 0
+    monkeypatch.setattr(crud, 'get_item', read_then_write)
+    assert crud.get_bond('H0001-S0001').sub_cost_center == 'CC010'
+    monkeypatch.setattr(crud, 'get_item', get_item)
+    assert crud.get_bond('H0001-S0001').sub_cost_center == 'CC099'
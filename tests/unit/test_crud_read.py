@@ -0,0 +1,104 @@
+import pytest
+
+from registry.db import RegistryClientError
+from registry import crud
+
+"""
+Read-only registry tests. These share a single pre-loaded table (see
+populated_table_with_gsi in conftest.py), so they must not write to it.
+"""
+
+
+def test_get_bond(populated_table_with_gsi):
+    """Find a bond with the given bond id."""
+    bond = crud.get_bond('H0002-S0003')
+
+    assert bond.host_account_id == 'H0002'
+    assert bond.sub_account_id == 'S0003'
+    assert bond.host_cost_center == 'CC002'
+    assert bond.sub_cost_center == 'CC012'
+    assert len(bond.subscribers) == 7
+    assert bond.subscribers.get('eniesc200').sid == 'eniesc200'
+    assert bond.subscribers.get('eniesc200').name == 'Ed'
+    assert bond.subscribers.get('eniesc200').email == 'ed@mail.com'
+    assert bond.subscribers.get('tfomoo100').name == 'Tom'
+    assert bond.subscribers.get('bfoere300').name == 'Bill'
+    assert bond.subscribers.get('yonou100').name == 'Yofo'
+    assert bond.subscribers.get('vdingdo200').name == 'Vince'
+    assert bond.subscribers.get('terfo000').name == 'Bob'
+    assert bond.subscribers.get('ming007').name == 'Ming'
+
+
+def test_get_bond_not_found(populated_table_with_gsi):
+    """Get a bond that does not exist. None will be returned."""
+    bond = crud.get_bond('rhubarb')
+    assert bond is None
+
+
+@pytest.mark.parametrize("get_bonds, value, expected", [
+    pytest.param(crud.get_bonds_by_host_cost_center, 'CC001',
+                 {'H0001-S0001', 'H0001-S0002'}, id="host_cost_center"),
+    pytest.param(crud.get_bonds_by_host_account_id, 'H0002',
+                 {'H0002-S0002', 'H0002-S0003'}, id="host_account_id"),
+    pytest.param(crud.get_bonds_by_sub_cost_center, 'CC010',
+                 {'H0001-S0001', 'H0002-S0002', 'H0003-S0004'},
+                 id="sub_cost_center"),
+    pytest.param(crud.get_bonds_by_sub_account_id, 'S0004',
+                 {'H0003-S0004'}, id="sub_account_id"),
+    pytest.param(crud.get_bonds_by_host_cost_center, 'Blah', set(),
+                 id="host_cost_center_not_found"),
+    pytest.param(crud.get_bonds_by_host_account_id, 'Blah', set(),
+                 id="host_account_id_not_found"),
+    pytest.param(crud.get_bonds_by_sub_cost_center, 'Blah', set(),
+                 id="sub_cost_center_not_found"),
+    pytest.param(crud.get_bonds_by_sub_account_id, 'Blah', set(),
+                 id="sub_account_id_not_found"),
+])
+def test_get_bonds_by_index(populated_table_with_gsi, get_bonds, value,
+                            expected):
+    """
+    Get all bonds for a given host or subscriber cost center or account id.
+    Searching for one that does not exist returns an empty list.
+    """
+    bonds = get_bonds(value)
+    assert len(bonds) == len(expected)
+    assert {bond.bond_id for bond in bonds} == expected
+
+
+def test_get_bond_by_host_cost_center_no_subscribers(populated_table_with_gsi):
+    """
+    Get all bonds for a given host cost center without their subscribers.
+    """
+    bonds = crud.get_bonds_by_host_cost_center(host_cost_center='CC001',
+                                               with_subscribers=False)
+    assert len(bonds) == 2
+    bond = [bond for bond in bonds if bond.bond_id == 'H0001-S0002'][0]
+    assert bond.host_account_id == 'H0001'
+    assert bond.sub_account_id == 'S0002'
+    assert bond.host_cost_center == 'CC001'
+    assert bond.sub_cost_center == 'CC012'
+    assert len(bond.subscribers) == 0
+
+
+def test_query_bonds_raw(populated_table_with_gsi):
+    """
+    Get the stored items of all bonds for a given host cost center.
+    """
+    items = crud.query_bonds_raw('host_cost_center', 'CC001')
+    assert len(items) == 2
+    item = [item for item in items if item['bond_id'] == 'H0001-S0002'][0]
+    assert item['host_account_id'] == 'H0001'
+    assert item['sub_cost_center'] == 'CC012'
+    assert item['subscribers']['eniesc200'] == {'sid': 'eniesc200',
+                                                'name': 'Ed',
+                                                'email': 'ed@mail.com'}
+
+
+def test_query_bonds_raw_no_value(populated_table_with_gsi):
+    """
+    Query without a value to search for. The request is invalid and is
+    rejected before it is sent: it will raise a RegistryClientError.
+    """
+    with pytest.raises(RegistryClientError) as e:
+        crud.query_bonds_raw('host_cost_center', None)
+    assert str(e.value).startswith("Invalid request:")
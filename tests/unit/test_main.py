@@ -0,0 +1,60 @@
+import pytest
+from fastapi import HTTPException
+
+from registry.models import Bond, BondRead
+from registry import main
+
+"""
+REST API tests. The endpoint functions are called directly, against the
+mock bond table.
+"""
+
+
+def test_update_bond_after_external_write(populated_table):
+    """
+    A bond read (and cached) before another worker adds a subscriber to it
+    is updated without losing that subscriber.
+    """
+    main.get_bond('H0001-S0001')  # caches the bond, with no subscribers
+
+    # another worker adds a subscriber; this worker's cache is not updated.
+    populated_table.update_item(
+        Key={'bond_id': 'H0001-S0001'},
+        UpdateExpression="set subscribers.#sid = :sub",
+        ExpressionAttributeNames={'#sid': 'jb'},
+        ExpressionAttributeValues={':sub': {'sid': 'jb',
+                                            'name': 'Joe',
+                                            'email': 'jb@mail.com'}})
+
+    # update the bond without sending its subscribers.
+    main.update_bond('H0001-S0001', Bond(bond_id='H0001-S0001',
+                                         host_account_id='H0001',
+                                         sub_account_id='S0001',
+                                         host_cost_center='CC001',
+                                         sub_cost_center='CC099'))
+
+    item = populated_table.get_item(Key={'bond_id': 'H0001-S0001'})['Item']
+    assert item['sub_cost_center'] == 'CC099'
+    assert set(item['subscribers']) == {'jb'}
+
+
+def test_get_bonds_no_filter(table):
+    """
+    Get bonds with neither a cost center nor an account id to filter on.
+    It will raise a 400 error.
+    """
+    with pytest.raises(HTTPException) as e:
+        main.get_bonds()
+    assert e.value.status_code == 400
+
+
+def test_get_bond(populated_table):
+    """
+    Get a bond. It is returned as stored, with its subscribers as dicts.
+    """
+    bond = main.get_bond('H0002-S0002')
+    assert isinstance(bond, BondRead)
+    assert bond.sub_cost_center == 'CC010'
+    assert bond.subscribers['eniesc200'] == {'sid': 'eniesc200',
+                                             'name': 'Ed',
+                                             'email': 'ed@mail.com'}
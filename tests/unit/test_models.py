@@ -1,12 +1,27 @@
 import pytest
+from pydantic import ValidationError
 
-from registry.models import Subscriber, Bond
+from registry.models import Subscriber, Bond, BondRead
 
 """
 Bond and Subscriber mutation tests, e.g. adding and removing subscribers from
 a bond.
 """
 
+# The subscribers of bond_with_subs. The fixture copies the dict, so tests
+# can add and remove subscribers freely.
+_SUBS = {
+    'eniesc200': Subscriber(sid='eniesc200',
+                            name='Ed',
+                            email='ed@mail.com'),
+    'tfomoo100': Subscriber(sid='tfomoo100',
+                            name='Tom',
+                            email='tom@snail.com'),
+    'bfoere300': Subscriber(sid='bfoere300',
+                            name='Bill',
+                            email='bill@mojo.com')
+}
+
 
 @pytest.fixture
 def bond_no_subs():
@@ -21,23 +36,12 @@ def bond_no_subs():
 @pytest.fixture
 def bond_with_subs():
     """Return a Bond with an existing set of subscribers"""
-    subs = {
-            'eniesc200': Subscriber(sid='eniesc200',
-                                    name='Ed',
-                                    email='ed@mail.com'),
-            'tfomoo100': Subscriber(sid='tfomoo100',
-                                    name='Tom',
-                                    email='tom@snail.com'),
-            'bfoere300': Subscriber(sid='bfoere300',
-                                    name='Bill',
-                                    email='bill@mojo.com')
-    }
     return Bond(bond_id='HostAcctA-SubAcctB',
                 host_account_id='HostAcctA',
                 sub_account_id='SubAcctB',
                 host_cost_center='HostCostCenterA',
                 sub_cost_center='SubCostCenterB',
-                subscribers=subs)
+                subscribers=dict(_SUBS))
 
 
 def test_add_subscriber_no_subs(bond_no_subs):
@@ -103,3 +107,46 @@ def test_remove_subscriber_not_existing(bond_with_subs):
     """Remove a subscriber who is not actually in the list"""
     bond_with_subs.remove_subscriber('sub0')
     assert len(bond_with_subs.subscribers) == 3  # nothing changed
+
+
+def test_from_trusted(bond_with_subs):
+    """Build a bond from already-validated data, e.g. an item read back
+    from the registry. It matches the validated bond."""
+    bond = Bond.from_trusted(bond_with_subs.dict())
+    assert bond == bond_with_subs
+    assert isinstance(bond.subscribers['eniesc200'], Subscriber)
+    assert bond.subscribers['eniesc200'].email == 'ed@mail.com'
+
+
+def test_from_trusted_no_subs():
+    """Build a bond from data with no subscribers. The subscribers default
+    to empty."""
+    bond = Bond.from_trusted({'bond_id': 'HostAcctA-SubAcctB',
+                              'host_account_id': 'HostAcctA',
+                              'sub_account_id': 'SubAcctB',
+                              'host_cost_center': 'HostCostCenterA',
+                              'sub_cost_center': 'SubCostCenterB'})
+    assert bond.subscribers == {}
+
+
+def test_subscriber_malformed_email():
+    """Create a subscriber with a malformed email address"""
+    with pytest.raises(ValidationError) as e:
+        Subscriber(sid='lmoreo200', name='Lynne', email='malformedemail')
+    assert e.value.errors()[0]['msg'] == "value is not a valid email address"
+    assert e.value.errors()[0]['type'] == "value_error.email"
+
+    # a trailing newline is not part of a valid address
+    with pytest.raises(ValidationError) as e:
+        Subscriber(sid='eniesc200', name='Ed', email='ed@mail.com\n')
+    assert e.value.errors()[0]['type'] == "value_error.email"
+
+
+def test_bond_read(bond_with_subs):
+    """Read a bond back for a response. The subscribers are passed through
+    as plain dicts."""
+    bond = BondRead.parse_obj(bond_with_subs.dict())
+    assert bond.dict() == bond_with_subs.dict()
+    assert bond.subscribers['eniesc200'] == {'sid': 'eniesc200',
+                                             'name': 'Ed',
+                                             'email': 'ed@mail.com'}